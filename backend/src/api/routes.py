@@ -2,7 +2,8 @@
 
 from urllib.parse import urlencode
 import secrets
-from fastapi import Request, Query, Header
+import orjson
+from fastapi import Request, Query, Header, Response
 from typing import Optional
 
 # Your existing imports...
@@ -409,7 +410,11 @@ async def get_performance_metrics():
     """Get current bot performance metrics"""
     try:
         metrics = trading_bot.get_bot_metrics()  # Remove 'await' here
-        return metrics
+        # orjson handles numpy scalars in C - no recursive conversion pass
+        return Response(
+            content=orjson.dumps(metrics, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+            media_type="application/json"
+        )
     except Exception as e:
         logger.error(f"Error getting performance metrics: {e}")
         return {
@@ -5,10 +5,19 @@ from src.utils.logger import logger
 import asyncio
 import json
 import time
-from typing import Dict
+from typing import Dict, List
+
+import orjson
 
 ws_router = APIRouter()
 
+# Fan-out limits for pre-serialized broadcasts
+MAX_CONCURRENT_SENDS = 100
+SEND_TIMEOUT = 5.0  # seconds before a slow client is dropped
+BROADCAST_BATCH = 50  # clients per batch before yielding to the event loop
+# orjson handles numpy scalars natively; int keys are stringified like stdlib json
+ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
 
 # ==================================================
 #           WEBSOCKET CONNECTION MANAGER
@@ -18,6 +27,8 @@ class WSManager:
         self.active_connections: list[WebSocket] = []
         self.last_tick_sent = 0  # For throttling tick spam
         self.tick_interval = 0.3  # Send a tick every 300ms max
+        # Caps concurrent sends so large client counts can't exhaust sockets
+        self._send_slots = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -33,34 +44,69 @@ class WSManager:
             f"WebSocket disconnected | Total clients: {len(self.active_connections)}"
         )
 
+    def has_clients(self) -> bool:
+        """True if at least one client is connected"""
+        return bool(self.active_connections)
+
     async def broadcast(self, message: dict):
         """Send JSON to all clients, removing any dead connections."""
+        # Serialize once, not once per client
+        payload = orjson.dumps(message, option=ORJSON_OPTS).decode()
         disconnected = []
         for ws in self.active_connections:
             try:
-                await ws.send_json(message)
+                await ws.send_text(payload)
             except Exception:
                 disconnected.append(ws)
 
         for ws in disconnected:
             self.disconnect(ws)
 
+    async def _send_prepared(self, websocket: WebSocket, payload: str):
+        async with self._send_slots:
+            await asyncio.wait_for(websocket.send_text(payload), SEND_TIMEOUT)
+
+    async def broadcast_prepared(self, payload: str):
+        """Send an already-serialized JSON payload to all clients concurrently"""
+        connections = list(self.active_connections)
+        for i in range(0, len(connections), BROADCAST_BATCH):
+            batch = connections[i:i + BROADCAST_BATCH]
+            results = await asyncio.gather(
+                *(self._send_prepared(ws, payload) for ws in batch),
+                return_exceptions=True
+            )
+            # Drop dead or stalled clients so later ticks don't wait on them
+            for ws, result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    logger.warning(f"Failed to send to client: {result!r}")
+                    self.disconnect(ws)
+            # Let other tasks (the next tick) run between batches
+            await asyncio.sleep(0)
+
     async def broadcast_signal(self, signal: Dict):
         """Broadcast new signal to all connected clients"""
         try:
-            message = {
-                "type": "signal",
-                "data": signal
-            }
-
-            for connection in self.active_connections:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    logger.warning(f"Failed to send signal to client: {e}")
+            # Serialize once, not once per client
+            payload = orjson.dumps(
+                {"type": "signal", "data": signal},
+                option=ORJSON_OPTS
+            ).decode()
+            await self.broadcast_prepared(payload)
         except Exception as e:
             logger.error(f"Error broadcasting signal: {e}")
 
+    async def broadcast_signals(self, signals: List[Dict]):
+        """Broadcast a tick's signals in order, each serialized once for all clients"""
+        try:
+            payloads = [
+                orjson.dumps({"type": "signal", "data": signal}, option=ORJSON_OPTS).decode()
+                for signal in signals
+            ]
+            for payload in payloads:
+                await self.broadcast_prepared(payload)
+        except Exception as e:
+            logger.error(f"Error broadcasting signals: {e}")
+
 
 ws_manager = WSManager()
 
@@ -301,6 +347,11 @@ async def broadcast_signal(signal_data: dict):
     await ws_manager.broadcast_signal(signal_data)
 
 
+async def broadcast_signals(signals: List[Dict]):
+    """Public function for other modules to broadcast a batch of signals"""
+    await ws_manager.broadcast_signals(signals)
+
+
 # ==================================================
 #     REGISTER BROADCASTER ON APP STARTUP
 # ==================================================
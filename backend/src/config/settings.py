@@ -152,5 +152,10 @@ class Settings:
         os.getenv("PERFORMANCE_LOG_INTERVAL", "300")
     )
 
+    # Contract monitor writes a compact binary log; CSV is for debugging only
+    CONTRACT_LOG_CSV: bool = os.getenv(
+        "CONTRACT_LOG_CSV", "False"
+    ).lower() == "true"
+
 
 settings = Settings()
\ No newline at end of file
@@ -27,6 +27,8 @@ class DerivAPIClient:
         self._balance = 0.0
         self._connection_lock = asyncio.Lock()
         self._authorize_event = asyncio.Event()
+        # Set when the authorized session is lost, cleared on the next successful authorize
+        self.disconnected = asyncio.Event()
         self._connect_timeout = 30
         
         # For multi-user mode
@@ -83,6 +85,7 @@ class DerivAPIClient:
             await self.ws.close()
             self.authorized = False
             self._authorize_event.clear()
+            self.disconnected.set()
 
     async def send(self, payload: Dict[str, Any]):
         """Send in single-user mode"""
@@ -113,6 +116,7 @@ class DerivAPIClient:
         except websockets.ConnectionClosed:
             logger.warning("Deriv WebSocket closed")
             self.authorized = False
+            self.disconnected.set()
             await asyncio.sleep(1)
             try:
                 await self.connect()
@@ -155,8 +159,11 @@ class DerivAPIClient:
                 if "error" in auth_data:
                     logger.error(f"Authorization error: {auth_data['error']}")
                     self.authorized = False
+                    # Wake the bot's run loop so it retries the session
+                    self.disconnected.set()
                 else:
                     self.authorized = True
+                    self.disconnected.clear()
                     bal = auth_data.get("balance")
                     if bal is not None:
                         try:
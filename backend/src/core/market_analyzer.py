@@ -1,6 +1,6 @@
 # backend/src/core/market_analyzer.py
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from src.utils.logger import logger
 
 
@@ -17,6 +17,11 @@ class MarketAnalyzer:
     def __init__(self):
         self.recent_prices: List[float] = []
         self.max_history = 100
+        # Window statistics are cached per recorded price; the version
+        # changes whenever the window does
+        self._price_version = 0
+        self._stats_version = -1
+        self._stats = (0.0, 0.0)
         self.volatility_threshold = 0.015  # Increased to 1.5% for R_50
         self.min_volatility_threshold = 0.00001  # Very low - allow flat markets
         self.trend_strength_threshold = 0.00003  # Reduced for more trades
@@ -26,6 +31,13 @@ class MarketAnalyzer:
         self.last_tradable_time = 0
         self.market_regime = "UNKNOWN"  # TRENDING, RANGING, VOLATILE, FLAT
 
+    def record_price(self, price: float):
+        """Append a price to the history without running the analysis"""
+        self.recent_prices.append(price)
+        if len(self.recent_prices) > self.max_history:
+            self.recent_prices.pop(0)
+        self._price_version += 1
+
     def analyze_market(self, price: float) -> Dict:
         """
         Comprehensive market analysis to determine if conditions are favorable for trading.
@@ -37,9 +49,7 @@ class MarketAnalyzer:
         # ---------------------------------------------------------
         # PRICE HISTORY TRACKING
         # ---------------------------------------------------------
-        self.recent_prices.append(price)
-        if len(self.recent_prices) > self.max_history:
-            self.recent_prices.pop(0)
+        self.record_price(price)
 
         # Need sufficient data for analysis
         if len(self.recent_prices) < 20:
@@ -126,45 +136,48 @@ class MarketAnalyzer:
         }
 
 
+    def _window_stats(self) -> Tuple[float, float]:
+        """Volatility and trend strength over the last 20 prices.
+
+        Both come from one array conversion, and the pair is reused until
+        a new price is recorded (e.g. by get_market_metrics between ticks).
+        """
+        if self._stats_version == self._price_version:
+            return self._stats
+
+        window = np.asarray(self.recent_prices[-20:], dtype=np.float64)
+        avg_price = window.mean()  # also the slow (20 period) SMA
+
+        if avg_price == 0:
+            stats = (0.0, 0.0)
+        else:
+            volatility = (window.max() - window.min()) / avg_price
+
+            # Fast (5) and medium (10) SMAs against the slow SMA;
+            # use the stronger trend signal
+            sma_fast = window[-5:].mean()
+            sma_medium = window[-10:].mean()
+            trend_strength = max(
+                abs(sma_fast - avg_price) / avg_price,
+                abs(sma_medium - avg_price) / avg_price
+            )
+            stats = (volatility, trend_strength)
+
+        self._stats = stats
+        self._stats_version = self._price_version
+        return stats
+
     def _calculate_volatility(self) -> float:
         """Calculate normalized volatility as percentage of price"""
         if len(self.recent_prices) < 10:
             return 0.0
-            
-        price_range = max(self.recent_prices[-20:]) - min(self.recent_prices[-20:])
-        avg_price = np.mean(self.recent_prices[-20:])
-        
-        if avg_price == 0:
-            return 0.0
-            
-        return price_range / avg_price
+        return self._window_stats()[0]
 
     def _calculate_trend_strength(self) -> float:
         """Calculate trend strength using multiple timeframes"""
         if len(self.recent_prices) < 20:
             return 0.0
-
-        # Fast SMA (5 periods)
-        sma_fast = np.mean(self.recent_prices[-5:])
-        
-        # Slow SMA (20 periods)  
-        sma_slow = np.mean(self.recent_prices[-20:])
-        
-        # Medium SMA (10 periods) for confirmation
-        sma_medium = np.mean(self.recent_prices[-10:])
-        
-        avg_price = np.mean(self.recent_prices[-20:])
-        if avg_price == 0:
-            return 0.0
-
-        # Calculate trend strength from multiple SMA comparisons
-        trend_strength_fast_slow = abs(sma_fast - sma_slow) / avg_price
-        trend_strength_medium_slow = abs(sma_medium - sma_slow) / avg_price
-        
-        # Use the stronger trend signal
-        trend_strength = max(trend_strength_fast_slow, trend_strength_medium_slow)
-        
-        return trend_strength
+        return self._window_stats()[1]
 
     def _check_price_stability(self) -> bool:
         """Optimized price stability filter for Deriv synthetic indices."""
@@ -233,6 +246,7 @@ class MarketAnalyzer:
     def reset(self):
         """Reset analyzer state"""
         self.recent_prices.clear()
+        self._stats_version = -1
         self.consecutive_rejects = 0
         self.last_tradable_time = 0
         self.market_regime = "UNKNOWN"
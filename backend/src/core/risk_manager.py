@@ -103,6 +103,9 @@ class RiskManager:
         self.total_losses = 0.0  # Fixed: Now properly tracks cumulative losses
         self.recovery_target = 0.0
         self.recovery_history = []
+        # Running totals over recovery_history so the stats need no rescan
+        self._recovered_count = 0
+        self._streak_total = 0
         self.fibonacci_sequence = self.config.fib_sequence
 
         # Hourly overtrading protection (preserved)
@@ -143,6 +146,8 @@ class RiskManager:
         self.recovery_streak = 0
         self.total_losses = 0.0  # Reset losses per session
         self.recovery_history.clear()
+        self._recovered_count = 0
+        self._streak_total = 0
         self.trade_count_1h = 0
         self.last_reset_time = time.time()
         self.hourly_trades.clear()
@@ -366,7 +371,7 @@ class RiskManager:
                     "timestamp": now,
                     "recovered": True
                 }
-                self.recovery_history.append(recovery_data)
+                self._record_recovery(recovery_data)
                 
                 # Safe step-back: Reduce streak aggressively on win
                 self.recovery_streak = max(0, self.recovery_streak - 2)
@@ -413,7 +418,7 @@ class RiskManager:
                     "timestamp": now,
                     "recovered": False
                 }
-                self.recovery_history.append(recovery_data)
+                self._record_recovery(recovery_data)
             else:
                 # No recovery, use conservative increase
                 if self.consecutive_losses >= 2:
@@ -431,6 +436,13 @@ class RiskManager:
         self._check_drawdown()
         self._check_daily_loss()
 
+    def _record_recovery(self, recovery_data: Dict):
+        """Append a recovery event and update the running totals"""
+        self.recovery_history.append(recovery_data)
+        self._streak_total += recovery_data["streak"]
+        if recovery_data["recovered"]:
+            self._recovered_count += 1
+
     # ==================================================
     # RECOVERY CALCULATIONS (PRESERVED)
     # ==================================================
@@ -593,6 +605,17 @@ class RiskManager:
             "lock_auto_expiry_seconds": self.config.lock_auto_expiry_seconds
         }
 
+    def get_recovery_stats(self) -> Dict:
+        """Summary of recorded recovery attempts, from the running totals (O(1))."""
+        attempts = len(self.recovery_history)
+        successful = self._recovered_count
+        return {
+            "total_attempts": attempts,
+            "successful_recoveries": successful,
+            "recovery_rate": round((successful / attempts) * 100, 1) if attempts > 0 else 0,
+            "avg_streak_length": round(self._streak_total / attempts, 1) if attempts > 0 else 0
+        }
+
     def get_risk_metrics(self) -> Dict:
         """Get comprehensive risk metrics including recovery data."""
         base_metrics = {
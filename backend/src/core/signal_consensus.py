@@ -175,7 +175,7 @@ class SignalConsensus:
                 and signal.get("score", 0) >= 0.80
                 and strategy_name in trusted_strategies
             ):
-                logger.info(f"✅ Accepting single strong signal from {strategy_name}")
+                logger.info("✅ Accepting single strong signal from %s", strategy_name)
                 return {
                     "side": signal["side"].upper(),
                     "score": round(signal["score"], 4),
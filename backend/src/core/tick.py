@@ -0,0 +1,10 @@
+# backend/src/core/tick.py
+from typing import NamedTuple
+
+# Normalized tick handed to strategies. Built once per incoming message
+# (quote as float, epoch as int) so strategies read attributes instead
+# of doing dict lookups and float() coercion on every tick.
+class Tick(NamedTuple):
+    quote: float
+    epoch: int
+    symbol: str
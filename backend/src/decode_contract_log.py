@@ -0,0 +1,28 @@
+# backend/src/decode_contract_log.py
+import sys
+import os
+import csv
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.contract_log import iter_records
+
+CSV_COLUMNS = [
+    'timestamp', 'contract_id', 'is_sold', 'is_expired',
+    'status', 'payout', 'sell_price', 'profit',
+    'entry_tick', 'exit_tick', 'message_type'
+]
+
+def decode_log(path: str):
+    """Convert a binary contract log (.bin) to CSV on stdout"""
+    writer = csv.DictWriter(sys.stdout, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    with open(path, 'rb') as f:
+        for record in iter_records(f):
+            writer.writerow(record)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python src/decode_contract_log.py <contract_log.bin>")
+        sys.exit(1)
+    decode_log(sys.argv[1])
@@ -0,0 +1,213 @@
+# backend/src/indicators/kernels.py
+"""Compiled indicator kernels for the per-tick strategy hot paths"""
+from typing import Tuple
+import numpy as np
+from src.utils.jit import njit
+
+
+# -------------------------------------------------------------
+# Per-tick indicator steps
+# -------------------------------------------------------------
+# Each strategy advances only the indicators it reads: `ema_bb_step` for
+# mean reversion, `rsi_macd_step` for momentum. Both share this layout of
+# the flat float64 state array (a state is owned by one strategy, so only
+# one step function ever advances its tick count `_N`).
+# Running values (NaN until their indicator has enough history):
+_N = 0
+_EMA_S = 1
+_EMA_L = 2
+_SEED_S = 3
+_SEED_L = 4
+_BB_SUM = 5
+_BB_SUMSQ = 6
+_BB_MID = 7
+_BB_UPDATES = 8
+_PREV_PRICE = 9
+_AVG_GAIN = 10
+_AVG_LOSS = 11
+_RSI = 12
+_RSI_PREV = 13
+_SEED_GAIN = 14
+_SEED_LOSS = 15
+_EMA_FAST = 16
+_EMA_SLOW = 17
+_SEED_FAST = 18
+_SEED_SLOW = 19
+_MACD_SIG = 20
+_SEED_SIG = 21
+# Fixed parameters and constants derived from them:
+_P_EMA_S = 22
+_P_EMA_L = 23
+_P_BB = 24
+_BB_STD = 25
+_P_RSI = 26
+_P_FAST = 27
+_P_SLOW = 28
+_P_SIG = 29
+_A_S = 30
+_A_L = 31
+_INV_BB = 32
+_RSI_INV = 33
+_RSI_KEEP = 34
+_A_FAST = 35
+_A_SLOW = 36
+_A_SIG = 37
+STATE_SIZE = 38
+
+# Re-sum the Bollinger window after this many updates to bound float drift
+BB_RESUM_INTERVAL = 1000
+
+
+def new_state(ema_short: int = 5, ema_long: int = 20, bb_period: int = 20, bb_std: float = 2.0,
+              rsi_period: int = 14, macd_fast: int = 12, macd_slow: int = 26,
+              macd_signal: int = 9) -> Tuple[np.ndarray, np.ndarray]:
+    """Allocate the state array and the Bollinger window ring for `ema_bb_step`"""
+    state = np.zeros(STATE_SIZE, dtype=np.float64)
+    for i in (_EMA_S, _EMA_L, _BB_MID, _AVG_GAIN, _AVG_LOSS, _RSI, _RSI_PREV,
+              _EMA_FAST, _EMA_SLOW, _MACD_SIG):
+        state[i] = np.nan
+
+    state[_P_EMA_S] = ema_short
+    state[_P_EMA_L] = ema_long
+    state[_P_BB] = bb_period
+    state[_BB_STD] = bb_std
+    state[_P_RSI] = rsi_period
+    state[_P_FAST] = macd_fast
+    state[_P_SLOW] = macd_slow
+    state[_P_SIG] = macd_signal
+
+    state[_A_S] = 2.0 / (ema_short + 1)
+    state[_A_L] = 2.0 / (ema_long + 1)
+    state[_INV_BB] = 1.0 / bb_period
+    state[_RSI_INV] = 1.0 / rsi_period
+    state[_RSI_KEEP] = (rsi_period - 1) / rsi_period
+    state[_A_FAST] = 2.0 / (macd_fast + 1)
+    state[_A_SLOW] = 2.0 / (macd_slow + 1)
+    state[_A_SIG] = 2.0 / (macd_signal + 1)
+
+    return state, np.zeros(bb_period, dtype=np.float64)
+
+
+@njit(cache=True, nogil=True)
+def _ema_update(state: np.ndarray, value: float, n: float, ema_i: int, seed_i: int, period_i: int, alpha_i: int):
+    """One EMA step; seeded with the SMA of the first `period` values"""
+    period = state[period_i]
+    if n > period:
+        a = state[alpha_i]
+        state[ema_i] = a * value + (1.0 - a) * state[ema_i]
+    else:
+        state[seed_i] += value
+        if n == period:
+            state[ema_i] = state[seed_i] / period
+
+
+@njit(cache=True, nogil=True)
+def ema_bb_step(state: np.ndarray, ring: np.ndarray, price: float):
+    """
+    Advance the EMA and Bollinger indicators by one price, mutating `state`.
+
+    Returns (short_ema, long_ema, bb_upper, bb_lower, bb_middle,
+    bb_middle_prev); values are NaN until the indicator has enough history.
+    """
+    n = state[_N] + 1.0
+    state[_N] = n
+
+    # Short / long EMA
+    _ema_update(state, price, n, _EMA_S, _SEED_S, _P_EMA_S, _A_S)
+    _ema_update(state, price, n, _EMA_L, _SEED_L, _P_EMA_L, _A_L)
+
+    # Bollinger running sums over the ring
+    p_bb = ring.shape[0]
+    idx = int(n - 1.0) % p_bb
+    if n > p_bb:
+        old = ring[idx]
+        state[_BB_SUM] -= old
+        state[_BB_SUMSQ] -= old * old
+    ring[idx] = price
+    state[_BB_SUM] += price
+    state[_BB_SUMSQ] += price * price
+
+    state[_BB_UPDATES] += 1.0
+    if state[_BB_UPDATES] >= BB_RESUM_INTERVAL:
+        state[_BB_UPDATES] = 0.0
+        total = 0.0
+        total_sq = 0.0
+        for i in range(p_bb):
+            total += ring[i]
+            total_sq += ring[i] * ring[i]
+        state[_BB_SUM] = total
+        state[_BB_SUMSQ] = total_sq
+
+    bb_prev = state[_BB_MID]
+    bb_upper = np.nan
+    bb_lower = np.nan
+    if n >= p_bb:
+        mid = state[_BB_SUM] * state[_INV_BB]
+        state[_BB_MID] = mid
+        variance = state[_BB_SUMSQ] * state[_INV_BB] - mid * mid
+        width = state[_BB_STD] * np.sqrt(variance) if variance > 0 else 0.0
+        bb_upper = mid + width
+        bb_lower = mid - width
+
+    return state[_EMA_S], state[_EMA_L], bb_upper, bb_lower, state[_BB_MID], bb_prev
+
+
+@njit(cache=True, nogil=True)
+def rsi_macd_step(state: np.ndarray, price: float):
+    """
+    Advance the RSI and MACD indicators by one price, mutating `state`.
+
+    Returns (rsi, rsi_prev, macd_line); the RSI values are NaN until there
+    is enough history and macd_line is 0.0 until then.
+    """
+    n = state[_N] + 1.0
+    state[_N] = n
+
+    # Wilder RSI
+    if n >= 2.0:
+        delta = price - state[_PREV_PRICE]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        k = n - 1.0
+        p_rsi = state[_P_RSI]
+        seeded = True
+        if k < p_rsi:
+            state[_SEED_GAIN] += gain
+            state[_SEED_LOSS] += loss
+            seeded = False
+        elif k == p_rsi:
+            state[_AVG_GAIN] = (state[_SEED_GAIN] + gain) / p_rsi
+            state[_AVG_LOSS] = (state[_SEED_LOSS] + loss) / p_rsi
+        else:
+            state[_AVG_GAIN] = state[_AVG_GAIN] * state[_RSI_KEEP] + gain * state[_RSI_INV]
+            state[_AVG_LOSS] = state[_AVG_LOSS] * state[_RSI_KEEP] + loss * state[_RSI_INV]
+
+        if seeded:
+            if state[_AVG_LOSS] == 0:
+                value = 100.0
+            else:
+                value = 100.0 - (100.0 / (1.0 + state[_AVG_GAIN] / state[_AVG_LOSS]))
+            state[_RSI_PREV] = state[_RSI]
+            state[_RSI] = value
+    state[_PREV_PRICE] = price
+
+    # MACD: fast/slow EMAs plus the signal-line EMA of their difference
+    _ema_update(state, price, n, _EMA_FAST, _SEED_FAST, _P_FAST, _A_FAST)
+    _ema_update(state, price, n, _EMA_SLOW, _SEED_SLOW, _P_SLOW, _A_SLOW)
+    macd_line = 0.0
+    if n >= state[_P_SLOW]:
+        macd_line = state[_EMA_FAST] - state[_EMA_SLOW]
+        _ema_update(state, macd_line, n - state[_P_SLOW] + 1.0, _MACD_SIG, _SEED_SIG, _P_SIG, _A_SIG)
+
+    return state[_RSI], state[_RSI_PREV], macd_line
+
+
+def warm_up():
+    """Compile the strategy kernels ahead of the first live tick.
+
+    cache=True stores the machine code in __pycache__, so after the first
+    run this only loads it; either way it keeps compilation off the tick path.
+    """
+    state, ring = new_state()
+    ema_bb_step(state, ring, 1.0)
+    rsi_macd_step(state, 1.0)
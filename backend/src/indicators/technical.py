@@ -3,37 +3,49 @@
 from typing import List, Tuple, Optional
 import math
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # scipy normally comes in with scikit-learn
+    lfilter = None
+
+
+def _smooth(values: np.ndarray, alpha: float, initial: float) -> np.ndarray:
+    """First-order recursive filter y[i] = alpha*x[i] + (1-alpha)*y[i-1], y[-1] = initial"""
+    if lfilter is not None:
+        smoothed, _ = lfilter([alpha], [1.0, -(1.0 - alpha)], values, zi=[(1.0 - alpha) * initial])
+        return smoothed
+
+    smoothed = np.empty_like(values)
+    prev = initial
+    for i in range(values.shape[0]):
+        prev = alpha * values[i] + (1.0 - alpha) * prev
+        smoothed[i] = prev
+    return smoothed
+
 
 def ema(values: List[float], period: int) -> List[float]:
     """Calculate Exponential Moving Average"""
-    if not values or period <= 0 or len(values) < period:
+    if period <= 0 or len(values) < period:
         return []
     
-    # Ensure we have numpy arrays for better performance
-    values_array = np.array(values, dtype=np.float64)
-    
-    # Initialize with SMA for first value
+    values_array = np.asarray(values, dtype=np.float64)
     k = 2.0 / (period + 1.0)
-    ema_values = []
-    
-    # Calculate SMA for first value
-    sma = np.mean(values_array[:period])
-    ema_values.append(sma)
     
-    # Calculate EMA for subsequent values
-    for i in range(period, len(values_array)):
-        ema_val = (values_array[i] - ema_values[-1]) * k + ema_values[-1]
-        ema_values.append(ema_val)
+    # Seed with the SMA of the first `period` values, then run the
+    # recurrence over the rest as a single linear filter
+    sma = values_array[:period].mean()
+    ema_values = _smooth(values_array[period:], k, sma)
     
-    return ema_values
+    return np.concatenate(([sma], ema_values)).tolist()
 
 def rsi(values: List[float], period: int = 14) -> List[float]:
     """Calculate Relative Strength Index with proper handling"""
     if len(values) < period + 1:
         return []
     
-    # Convert to numpy for better performance
-    values_array = np.array(values, dtype=np.float64)
+    values_array = np.asarray(values, dtype=np.float64)
     
     # Calculate price changes
     deltas = np.diff(values_array)
@@ -42,35 +54,17 @@ def rsi(values: List[float], period: int = 14) -> List[float]:
     gains = np.where(deltas > 0, deltas, 0.0)
     losses = np.where(deltas < 0, -deltas, 0.0)
     
-    # Initialize RSI array
-    rsi_values = []
-    
-    # Calculate first average gain and loss
+    # Wilder smoothing is an EMA with alpha = 1/period, seeded with the SMA
     avg_gain = np.mean(gains[:period])
     avg_loss = np.mean(losses[:period])
+    avg_gains = np.concatenate(([avg_gain], _smooth(gains[period:], 1.0 / period, avg_gain)))
+    avg_losses = np.concatenate(([avg_loss], _smooth(losses[period:], 1.0 / period, avg_loss)))
     
-    # Handle division by zero
-    if avg_loss == 0:
-        first_rsi = 100.0
-    else:
-        rs = avg_gain / avg_loss
-        first_rsi = 100.0 - (100.0 / (1.0 + rs))
-    
-    rsi_values.append(first_rsi)
-    
-    # Calculate subsequent RSI values using smoothing
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-        
-        if avg_loss == 0:
-            rsi_values.append(100.0)
-        else:
-            rs = avg_gain / avg_loss
-            rsi_val = 100.0 - (100.0 / (1.0 + rs))
-            rsi_values.append(rsi_val)
-    
-    return rsi_values
+    # Handle division by zero (no losses → RSI 100)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi_values = np.where(avg_losses == 0, 100.0, 100.0 - (100.0 / (1.0 + avg_gains / avg_losses)))
+    
+    return rsi_values.tolist()
 
 
 def bollinger_bands(values: List[float], period: int = 20, std_dev: float = 2) -> List[tuple]:
@@ -78,18 +72,13 @@ def bollinger_bands(values: List[float], period: int = 20, std_dev: float = 2) -
     if len(values) < period:
         return []
     
-    bands = []
-    for i in range(period, len(values) + 1):
-        window = values[i-period:i]
-        middle = sum(window) / period
-        variance = sum((x - middle) ** 2 for x in window) / period
-        std = variance ** 0.5
-        
-        upper = middle + (std_dev * std)
-        lower = middle - (std_dev * std)
-        bands.append((upper, middle, lower))
-    
-    return bands
+    windows = sliding_window_view(np.asarray(values, dtype=np.float64), period)
+    middle = windows.mean(axis=1)
+    std = windows.std(axis=1)
+    
+    upper = middle + std_dev * std
+    lower = middle - std_dev * std
+    return list(zip(upper.tolist(), middle.tolist(), lower.tolist()))
 
 def atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> List[float]:
     """Calculate Average True Range"""
@@ -120,42 +109,27 @@ def macd(values: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -
         return []
     
     # Calculate EMAs
-    ema_fast = ema(values, fast)
-    ema_slow = ema(values, slow)
+    ema_fast = np.asarray(ema(values, fast))
+    ema_slow = np.asarray(ema(values, slow))
     
     # Align lengths (take the last common values)
     min_len = min(len(ema_fast), len(ema_slow))
     if min_len < signal + 1:
         return []
     
-    ema_fast = ema_fast[-min_len:]
-    ema_slow = ema_slow[-min_len:]
+    # MACD line (difference between fast and slow EMA)
+    macd_line = ema_fast[-min_len:] - ema_slow[-min_len:]
     
-    # Calculate MACD line (difference between fast and slow EMA)
-    macd_line = []
-    for i in range(min_len):
-        macd_val = ema_fast[i] - ema_slow[i]
-        macd_line.append(macd_val)
-    
-    # Calculate signal line (EMA of MACD line)
-    signal_line = ema(macd_line, signal)
-    
-    # Align signal line with macd_line
+    # Signal line (EMA of MACD line)
+    signal_line = np.asarray(ema(macd_line, signal))
     if len(signal_line) < 1:
         return []
     
-    # Calculate histogram (difference between MACD line and signal line)
-    histogram = []
-    result = []
-    
-    # We need to align the arrays properly
-    offset = len(macd_line) - len(signal_line)
-    for i in range(len(signal_line)):
-        hist_val = macd_line[i + offset] - signal_line[i]
-        histogram.append(hist_val)
-        result.append((macd_line[i + offset], signal_line[i], hist_val))
+    # Align the MACD line with the signal line and take the histogram
+    macd_line = macd_line[len(macd_line) - len(signal_line):]
+    histogram = macd_line - signal_line
     
-    return result
+    return list(zip(macd_line.tolist(), signal_line.tolist(), histogram.tolist()))
 
 # Helper functions for momentum strategy
 def calculate_rsi_momentum(rsi_values: List[float], current_price: float, previous_price: float) -> Optional[float]:
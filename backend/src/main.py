@@ -181,4 +181,4 @@ app.json_encoder_class = CustomJSONEncoder
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto")
\ No newline at end of file
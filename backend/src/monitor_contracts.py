@@ -5,18 +5,38 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 import asyncio
+import heapq
 import time
 import json
 from datetime import datetime
+from functools import cached_property
 from typing import Dict, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import csv
 
+import orjson
+
 from src.core.deriv_api import deriv
 from src.utils.logger import logger
 from src.trading.position_manager import position_manager
 from src.trading.order_executor import order_executor
 from src.config.settings import settings
+from src.utils.contract_log import pack_snapshot
+
+# Small, fixed vocabulary of status/message strings - interned so that
+# snapshots share one object per value and comparisons hit the identity fast path
+_STATUS = {
+    s: sys.intern(s)
+    for s in ("sold", "won", "lost", "opened", "unknown", "contract_update", "sell", "buy")
+}
+_CLOSED_STATUSES = frozenset({_STATUS["sold"], _STATUS["won"], _STATUS["lost"]})
+
+# A position still open this long after it was opened is considered stuck
+STUCK_CONTRACT_SECONDS = 300
+# How often a stuck contract is re-checked while it stays open
+STUCK_RECHECK_SECONDS = 30
+# Don't re-send proposal_open_contract for a contract probed this recently
+STUCK_PROBE_COOLDOWN_SECONDS = 60
 
 @dataclass
 class ContractSnapshot:
@@ -34,15 +54,32 @@ class ContractSnapshot:
     message_type: str = ""
     raw_data: Dict[str, Any] = None
     
+    @cached_property
+    def raw_json(self):
+        """raw_data serialized to a JSON string, computed on first access only"""
+        if not self.raw_data:
+            return self.raw_data
+        try:
+            return orjson.dumps(self.raw_data).decode()
+        except Exception:
+            return str(self.raw_data)
+    
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
-        data = asdict(self)
-        if self.raw_data:
-            try:
-                data['raw_data'] = json.dumps(self.raw_data)
-            except Exception:
-                data['raw_data'] = str(self.raw_data)
-        return data
+        return {
+            "contract_id": self.contract_id,
+            "timestamp": self.timestamp,
+            "is_sold": self.is_sold,
+            "is_expired": self.is_expired,
+            "status": self.status,
+            "payout": self.payout,
+            "sell_price": self.sell_price,
+            "profit": self.profit,
+            "entry_tick": self.entry_tick,
+            "exit_tick": self.exit_tick,
+            "message_type": self.message_type,
+            "raw_data": self.raw_json,
+        }
 
 class ContractMonitor:
     """Advanced contract monitoring system"""
@@ -52,12 +89,30 @@ class ContractMonitor:
         self.closed_contracts: Dict[str, ContractSnapshot] = {}
         self.message_log = []
         self.is_running = False
-        self.log_file = f"contract_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        self.log_csv = settings.CONTRACT_LOG_CSV
+        self._log_fh = None
+        # Min-heap of (check_at, contract_id) - only contracts due for a
+        # stuck check are ever looked at by periodic_check
+        self._expiry_heap: list[tuple[float, str]] = []
+        # contract_id -> last time a proposal_open_contract probe was sent
+        self._last_probed: Dict[str, float] = {}
+        # contract_id -> material fields of the last update that was recorded
+        self._last_sig: Dict[str, tuple] = {}
+        log_ext = "csv" if self.log_csv else "bin"
+        self.log_file = f"contract_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{log_ext}"
         self.setup_logging()
     
     def setup_logging(self):
-        """Setup CSV logging for contract data"""
+        """Setup contract data logging (binary records, or CSV in debug mode)"""
         try:
+            if not self.log_csv:
+                # Kept open for the monitor's lifetime; writes are buffered
+                # and flushed from periodic_check. Decode with
+                # src/decode_contract_log.py
+                self._log_fh = open(self.log_file, 'wb')
+                logger.info(f"Contract log created: {self.log_file}")
+                return
+            
             with open(self.log_file, 'w', newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow([
@@ -69,8 +124,32 @@ class ContractMonitor:
         except Exception as e:
             logger.error(f"Failed to create log file: {e}")
     
+    def flush_log(self):
+        """Flush buffered binary log records to disk"""
+        if self._log_fh is not None:
+            try:
+                self._log_fh.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush contract log: {e}")
+    
+    def close_log(self):
+        """Close the binary log file handle"""
+        if self._log_fh is not None:
+            try:
+                self._log_fh.close()
+            except Exception as e:
+                logger.error(f"Failed to close contract log: {e}")
+            self._log_fh = None
+    
     def log_contract_data(self, snapshot: ContractSnapshot):
-        """Log contract data to CSV"""
+        """Log contract data as a binary record (CSV row in debug mode)"""
+        if self._log_fh is not None:
+            try:
+                self._log_fh.write(pack_snapshot(snapshot))
+            except Exception as e:
+                logger.error(f"Failed to log contract data: {e}")
+            return
+        
         try:
             with open(self.log_file, 'a', newline='') as f:
                 writer = csv.writer(f)
@@ -146,12 +225,32 @@ class ContractMonitor:
         """Handle contract update messages"""
         contract_id = str(contract_data.get("id") or contract_data.get("contract_id", "unknown"))
         
+        # Skip the snapshot + log row when none of the fields we store has
+        # changed. Profit moves with the spot on open contracts, so this mostly
+        # drops repeated updates and re-sends of an unchanged contract.
+        sig = (
+            contract_data.get("status"),
+            contract_data.get("is_sold"),
+            contract_data.get("is_expired"),
+            contract_data.get("payout"),
+            contract_data.get("sell_price"),
+            contract_data.get("profit"),
+            contract_data.get("entry_tick"),
+            contract_data.get("exit_tick"),
+        )
+        if self._last_sig.get(contract_id) == sig:
+            return
+        self._last_sig[contract_id] = sig
+        
+        raw_status = str(contract_data.get("status") or "unknown")
+        status = _STATUS.get(raw_status) or sys.intern(raw_status)
+        
         snapshot = ContractSnapshot(
             contract_id=contract_id,
             timestamp=timestamp,
             is_sold=contract_data.get("is_sold", False) in [True, 1, "1"],
             is_expired=contract_data.get("is_expired", False) in [True, 1, "1"],
-            status=contract_data.get("status", "unknown"),
+            status=status,
             payout=float(contract_data.get("payout", 0) or 0),
             sell_price=float(contract_data.get("sell_price", 0) or 0),
             profit=float(contract_data.get("profit", 0) or 0),
@@ -161,10 +260,12 @@ class ContractMonitor:
             raw_data=contract_data
         )
         
-        if snapshot.is_sold or snapshot.is_expired or snapshot.status in ["sold", "won", "lost"]:
+        if snapshot.is_sold or snapshot.is_expired or snapshot.status in _CLOSED_STATUSES:
             self.closed_contracts[contract_id] = snapshot
             if contract_id in self.active_contracts:
                 del self.active_contracts[contract_id]
+            self._last_probed.pop(contract_id, None)
+            self._last_sig.pop(contract_id, None)
             
             logger.info(f"🎯 CONTRACT {'EXPIRED' if snapshot.is_expired else 'CLOSED'}: {contract_id}")
             logger.info(f"   Status: {snapshot.status}")
@@ -216,33 +317,60 @@ class ContractMonitor:
         logger.info(f"🛒 BUY CONFIRMED: {contract_id}")
         logger.info(f"   Proposal ID: {buy_data.get('proposal_id')}")
         
+        if contract_id != "unknown":
+            self._schedule_expiry_check(contract_id, time.time())
+        
         self.log_contract_data(snapshot)
     
+    def _schedule_expiry_check(self, contract_id: str, opened_at: float):
+        """Queue a stuck-contract check for when the contract becomes overdue"""
+        heapq.heappush(self._expiry_heap, (opened_at + STUCK_CONTRACT_SECONDS, contract_id))
+    
     async def periodic_check(self):
         """Periodically check for stuck contracts"""
         while self.is_running:
-            await asyncio.sleep(30)
+            # Wake up when the earliest contract becomes due (at most every 30s)
+            delay = STUCK_RECHECK_SECONDS
+            if self._expiry_heap:
+                delay = min(delay, max(0.0, self._expiry_heap[0][0] - time.time()))
+            await asyncio.sleep(delay)
+            self.flush_log()
             
             try:
                 current_time = time.time()
                 stuck_contracts = []
                 
-                for contract_id, pos in list(position_manager.active_positions.items()):
-                    opened_at = pos.get("opened_at", 0)
-                    expires_at = pos.get("expires_at", 0)
-                    
-                    if opened_at and current_time - opened_at > 300:
+                while self._expiry_heap and self._expiry_heap[0][0] <= current_time:
+                    _, contract_id = heapq.heappop(self._expiry_heap)
+                    if contract_id in position_manager.active_positions and contract_id not in stuck_contracts:
                         stuck_contracts.append(contract_id)
+                        # Keep probing it until it closes
+                        heapq.heappush(self._expiry_heap, (current_time + STUCK_RECHECK_SECONDS, contract_id))
                 
                 if stuck_contracts:
                     logger.warning(f"⚠️  Found {len(stuck_contracts)} potentially stuck contracts:")
+                    to_probe = []
                     for contract_id in stuck_contracts:
                         logger.warning(f"   - {contract_id}")
-                        await deriv.send({
-                            "proposal_open_contract": 1,
-                            "contract_id": contract_id,
-                            "subscribe": 0
-                        })
+                        if current_time - self._last_probed.get(contract_id, 0) >= STUCK_PROBE_COOLDOWN_SECONDS:
+                            self._last_probed[contract_id] = current_time
+                            to_probe.append(contract_id)
+                    
+                    # Fire all probes together rather than one round trip at a time
+                    results = await asyncio.gather(
+                        *(
+                            deriv.send({
+                                "proposal_open_contract": 1,
+                                "contract_id": contract_id,
+                                "subscribe": 0
+                            })
+                            for contract_id in to_probe
+                        ),
+                        return_exceptions=True
+                    )
+                    for contract_id, result in zip(to_probe, results):
+                        if isinstance(result, Exception):
+                            logger.error(f"Failed to probe contract {contract_id}: {result}")
             
             except Exception as e:
                 logger.error(f"Error in periodic check: {e}")
@@ -259,6 +387,11 @@ class ContractMonitor:
         
         await deriv.add_listener(self.message_listener)
         
+        # Positions opened before the monitor started are seeded once;
+        # new ones are scheduled as their buy confirmations arrive
+        for contract_id, pos in list(position_manager.active_positions.items()):
+            self._schedule_expiry_check(contract_id, pos.get("opened_at") or time.time())
+        
         periodic_task = asyncio.create_task(self.periodic_check())
         
         try:
@@ -269,6 +402,7 @@ class ContractMonitor:
         finally:
             self.is_running = False
             periodic_task.cancel()
+            self.close_log()
     
     async def stop_monitoring(self):
         """Stop the contract monitoring system"""
@@ -337,4 +471,11 @@ async def main():
         await contract_monitor.stop_monitoring()
 
 if __name__ == "__main__":
+    # uvloop's libuv-based loop cuts per-message overhead on the tick stream;
+    # fall back to the stock loop where it isn't available (e.g. Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
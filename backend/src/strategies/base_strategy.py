@@ -2,6 +2,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Optional
 from src.utils.logger import logger
+from src.core.tick import Tick
 
 class BaseStrategy(ABC):
     """Base class for all trading strategies"""
@@ -13,12 +14,12 @@ class BaseStrategy(ABC):
         self.signal_history = []
     
     @abstractmethod
-    def on_tick(self, tick: Dict) -> Optional[Dict]:
+    def on_tick(self, tick: Tick) -> Optional[Dict]:
         """
         Analyze a tick and return a signal if one is generated.
         
         Args:
-            tick: Tick data dict with keys: symbol, quote, epoch, etc.
+            tick: Tick namedtuple (quote: float, epoch: int, symbol: str)
             
         Returns:
             Signal dict or None:
@@ -31,6 +32,10 @@ class BaseStrategy(ABC):
         """
         pass
     
+    def reset(self):
+        """Override to clear accumulated tick/trade state, keeping the configuration"""
+        pass
+    
     def should_trade(self) -> bool:
         """Override to add strategy-specific trading conditions"""
         return True
@@ -1,9 +1,15 @@
 # backend/src/strategies/breakout.py
 from .base_strategy import BaseStrategy
+from collections import deque
+from itertools import islice
 from typing import Dict, List
 import numpy as np
 from src.utils.logger import logger
-from src.indicators.technical import atr, ema
+from src.core.tick import Tick
+
+# Prices retained for the breakout windows; the list is trimmed back to
+# this size only once it doubles, so the copy is amortised over many ticks
+PRICE_WINDOW = 150
 
 class BreakoutStrategy(BaseStrategy):
     name = "breakout"
@@ -15,19 +21,39 @@ class BreakoutStrategy(BaseStrategy):
         self.confirmation_bars = confirmation_bars
         self.optimize = optimize
         
+        self.reset()
+        
+        if optimize:
+            self._optimize_parameters()
+
+    def reset(self):
+        """Clear all tick, signal and trade state, keeping the configuration"""
         self.prices: List[float] = []
-        self.highs: List[float] = []
-        self.lows: List[float] = []
-        self.performance_history = []
-        self.signal_history = []
+        # Bounded histories - only the tail is ever read back
+        self.performance_history = deque(maxlen=128)
+        self.signal_history = deque(maxlen=256)
+        # Lifetime totals for the metrics (the deques above only keep the tail)
+        self._signal_count = 0
+        self._trade_count = 0
+        self._win_count = 0
+        self._profit_total = 0.0
         
         # Adaptive parameters - BALANCED
-        self.dynamic_threshold = threshold
+        self.dynamic_threshold = self.base_threshold
         self.breakout_strength = 1.0
-        self.recent_breakouts = []
-        
-        if optimize:
-            self._optimize_parameters()
+        self.recent_breakouts = deque(maxlen=15)
+
+        # Incremental Wilder ATR state (updated once per tick)
+        self.current_atr = None
+        self._atr_seed_sum = 0.0
+        self._atr_seed_count = 0
+        self._last_close = None
+
+        # Monotonic (tick_index, price) queues for the rolling window high/low:
+        # the front is always the extreme of the last `window` prices
+        self._tick_index = 0
+        self._max_q = deque()
+        self._min_q = deque()
 
     def _optimize_parameters(self):
         """Optimize breakout parameters based on market volatility and performance"""
@@ -35,23 +61,24 @@ class BreakoutStrategy(BaseStrategy):
             return
             
         try:
-            # Calculate market volatility using ATR
-            if len(self.prices) >= self.atr_period:
-                atr_values = atr(self.highs, self.lows, self.prices, self.atr_period)
-                if atr_values:
-                    current_atr = atr_values[-1]
-                    avg_price = np.mean(self.prices[-10:])
-                    
-                    # Adjust threshold based on volatility (ATR as % of price) - BALANCED
-                    atr_percentage = current_atr / avg_price if avg_price > 0 else 0.001
-                    # More sensitive thresholds for synthetic indices
-                    self.dynamic_threshold = max(0.0003, min(0.002, atr_percentage * 1.2))
+            # Calculate market volatility using the incrementally maintained ATR
+            if self.current_atr is not None:
+                avg_price = np.mean(self.prices[-10:])
+                
+                # Adjust threshold based on volatility (ATR as % of price) - BALANCED
+                atr_percentage = self.current_atr / avg_price if avg_price > 0 else 0.001
+                # More sensitive thresholds for synthetic indices
+                self.dynamic_threshold = max(0.0003, min(0.002, atr_percentage * 1.2))
             
             # Performance-based optimization
             if self.performance_history:
-                recent_performance = self.performance_history[-8:]
-                if recent_performance:
-                    win_rate = sum(1 for p in recent_performance if p > 0) / len(recent_performance)
+                recent_count = min(8, len(self.performance_history))
+                recent_wins = 0
+                for p in islice(self.performance_history, len(self.performance_history) - recent_count, None):
+                    if p > 0:
+                        recent_wins += 1
+                if recent_count:
+                    win_rate = recent_wins / recent_count
                     
                     if win_rate < 0.35:  # More lenient than 0.3
                         # Slightly increase threshold
@@ -74,6 +101,25 @@ class BreakoutStrategy(BaseStrategy):
         except Exception as e:
             logger.error(f"Breakout optimization error: {e}")
 
+    def _update_atr(self, high: float, low: float, close: float):
+        """Advance the Wilder-smoothed ATR by one bar in O(1)"""
+        last_close = self._last_close
+        self._last_close = close
+        if last_close is None:
+            return
+
+        true_range = max(high - low, abs(high - last_close), abs(low - last_close))
+        period = self.atr_period
+
+        if self.current_atr is None:
+            # Seed with the simple average of the first `period` true ranges
+            self._atr_seed_sum += true_range
+            self._atr_seed_count += 1
+            if self._atr_seed_count == period:
+                self.current_atr = self._atr_seed_sum / period
+        else:
+            self.current_atr = (self.current_atr * (period - 1) + true_range) / period
+
     def _calculate_volume_confirmation(self, current_high: float, current_low: float) -> float:
         """Calculate volume/price confirmation for breakouts"""
         if len(self.prices) < 8:
@@ -110,87 +156,117 @@ class BreakoutStrategy(BaseStrategy):
             recent_low = min(self.prices[-5:-1])
             return price > recent_low * 1.002  # More permissive (1.002 vs 1.001)
 
-    def on_tick(self, tick: Dict):
-        price = float(tick["quote"])
-        self.prices.append(price)
+    def _update_window(self, price: float):
+        """Advance the rolling window high/low by one price (amortised O(1))"""
+        i = self._tick_index
+        self._tick_index = i + 1
+        expired = i - self.window
+
+        max_q = self._max_q
+        while max_q and max_q[-1][1] <= price:
+            max_q.pop()
+        max_q.append((i, price))
+        if max_q[0][0] <= expired:
+            max_q.popleft()
+
+        min_q = self._min_q
+        while min_q and min_q[-1][1] >= price:
+            min_q.pop()
+        min_q.append((i, price))
+        if min_q[0][0] <= expired:
+            min_q.popleft()
+
+    def on_tick(self, tick: Tick):
+        price = tick.quote
+        # Hoist hot attributes into locals (LOAD_FAST instead of LOAD_ATTR)
+        prices = self.prices
+        prices.append(price)
+        # High and low are the tick price itself, so no separate buffers
+        self._update_atr(price, price, price)
+        self._update_window(price)
         
-        # Track highs and lows (simplified - using same as price for now)
-        self.highs.append(price)
-        self.lows.append(price)
+        # Maintain reasonable data size (every reader looks at the last 30 at most)
+        if len(prices) > 2 * PRICE_WINDOW:
+            del prices[:-PRICE_WINDOW]
         
-        # Maintain reasonable data size
-        if len(self.prices) > 150:
-            self.prices = self.prices[-150:]
-            self.highs = self.highs[-150:]
-            self.lows = self.lows[-150:]
+        window = self.window
+        n_prices = len(prices)
         
-        if len(self.prices) < self.window:
+        if n_prices < window:
             return None
-            
-        window_vals = self.prices[-self.window:]
-        current_high = max(window_vals)
-        current_low = min(window_vals)
         
-        # Calculate confirmation strength
-        confirmation_strength = self._calculate_volume_confirmation(current_high, current_low)
+        dthr = self.dynamic_threshold
+        current_high = self._max_q[0][1]
+        current_low = self._min_q[0][1]
         
         signals = []
         
-        # Upward breakout with confirmation → RISE signal
-        if price >= current_high * (1 + self.dynamic_threshold):
-            if not self._is_fake_breakout(price, "up"):
-                base_score = 0.75 * self.breakout_strength * confirmation_strength  # Increased from 0.7
-                final_score = min(0.92, base_score)  # Reduced from 0.95
-                signals.append(("RISE", final_score, "up_breakout"))
+        up_break = price >= current_high * (1 + dthr)
+        down_break = price <= current_low * (1 - dthr)
         
-        # Downward breakout with confirmation → FALL signal
-        if price <= current_low * (1 - self.dynamic_threshold):
-            if not self._is_fake_breakout(price, "down"):
-                base_score = 0.75 * self.breakout_strength * confirmation_strength  # Increased from 0.7
-                final_score = min(0.92, base_score)  # Reduced from 0.95
-                signals.append(("FALL", final_score, "down_breakout"))
+        # Confirmation strength is only needed once a breakout is possible
+        # (computed lazily below for larger-timeframe-only signals)
+        confirmation_strength = None
+        if up_break or down_break:
+            confirmation_strength = self._calculate_volume_confirmation(current_high, current_low)
+            breakout_score = min(0.92, 0.75 * self.breakout_strength * confirmation_strength)  # Reduced from 0.95
+        
+            # Upward breakout with confirmation → RISE signal
+            if up_break and not self._is_fake_breakout(price, "up"):
+                signals.append(("RISE", breakout_score, "up_breakout"))
+            
+            # Downward breakout with confirmation → FALL signal
+            if down_break and not self._is_fake_breakout(price, "down"):
+                signals.append(("FALL", breakout_score, "down_breakout"))
         
         # Multi-timeframe confirmation (if we have enough data)
-        if len(self.prices) >= self.window * 1.5:  # Reduced from 2
-            larger_window = self.prices[-int(self.window*1.5):-self.window]
+        if n_prices >= window * 1.5:  # Reduced from 2
+            larger_window = prices[-int(window*1.5):-window]
             if larger_window:
                 larger_high = max(larger_window)
                 larger_low = min(larger_window)
+                larger_thr = dthr * 0.6  # Increased from 0.5
                 
                 # Breakout from larger timeframe resistance → RISE signal
-                if price >= larger_high * (1 + self.dynamic_threshold * 0.6):  # Increased from 0.5
+                if price >= larger_high * (1 + larger_thr):
                     signals.append(("RISE", 0.75, "larger_tf_breakout"))  # Reduced from 0.8
                     
                 # Breakout from larger timeframe support → FALL signal
-                if price <= larger_low * (1 - self.dynamic_threshold * 0.6):  # Increased from 0.5
+                if price <= larger_low * (1 - larger_thr):
                     signals.append(("FALL", 0.75, "larger_tf_breakout"))  # Reduced from 0.8
         
         # Take the strongest signal
         if signals:
-            signals.sort(key=lambda x: x[1], reverse=True)
-            side, strength, breakout_type = signals[0]
+            # At most 4 candidates - a linear scan beats sort(); first one wins ties
+            best = signals[0]
+            for candidate in signals[1:]:
+                if candidate[1] > best[1]:
+                    best = candidate
+            side, strength, breakout_type = best
             
             # Store signal for tracking
             self.signal_history.append({
-                "timestamp": tick.get("epoch"),
+                "timestamp": tick.epoch,
                 "side": side,
                 "score": strength,
                 "breakout_type": breakout_type,
-                "threshold_used": self.dynamic_threshold,
+                "threshold_used": dthr,
                 "price": price
             })
+            self._signal_count += 1
             
-            # Track this breakout for optimization
+            # Track this breakout for optimization (deque keeps the last 15)
             self.recent_breakouts.append(True)
-            if len(self.recent_breakouts) > 15:  # Reduced from 20
-                self.recent_breakouts = self.recent_breakouts[-15:]
+            
+            if confirmation_strength is None:
+                confirmation_strength = self._calculate_volume_confirmation(current_high, current_low)
             
             return {
                 "side": side, 
                 "score": strength, 
                 "meta": {
                     "breakout_type": breakout_type,
-                    "dynamic_threshold": round(self.dynamic_threshold, 6),
+                    "dynamic_threshold": round(dthr, 6),
                     "breakout_strength": round(self.breakout_strength, 2),
                     "confirmation_strength": round(confirmation_strength, 2),
                     "strategy": self.name
@@ -202,27 +278,32 @@ class BreakoutStrategy(BaseStrategy):
     def update_performance(self, trade_result: str, profit: float):
         """Update strategy performance for optimization"""
         self.performance_history.append(profit)
+        self._trade_count += 1
+        self._profit_total += profit
+        if profit > 0:
+            self._win_count += 1
         
         # Update recent breakouts success rate
         if self.recent_breakouts:
             self.recent_breakouts[-1] = profit > 0
         
-        if self.optimize and len(self.performance_history) % 4 == 0:  # More frequent
+        if self.optimize and self._trade_count % 4 == 0:  # More frequent
             self._optimize_parameters()
 
     def get_strategy_metrics(self) -> Dict:
         """Get strategy performance metrics"""
-        if not self.performance_history:
+        if not self._trade_count:
             return {}
             
-        wins = sum(1 for p in self.performance_history if p > 0)
-        losses = sum(1 for p in self.performance_history if p < 0)
-        total_trades = len(self.performance_history)
-        win_rate = wins / total_trades if total_trades > 0 else 0
+        # Lifetime figures from the running totals
+        total_trades = self._trade_count
+        win_rate = self._win_count / total_trades
+        avg_profit = self._profit_total / total_trades
         
         # Analyze breakout types
         breakout_types = {}
-        for signal in self.signal_history[-40:]:  # Reduced from 50
+        recent_signals = islice(self.signal_history, max(0, len(self.signal_history) - 40), None)
+        for signal in recent_signals:  # Reduced from 50
             br_type = signal.get("breakout_type", "unknown")
             breakout_types[br_type] = breakout_types.get(br_type, 0) + 1
         
@@ -230,13 +311,13 @@ class BreakoutStrategy(BaseStrategy):
         success_rate = sum(self.recent_breakouts) / len(self.recent_breakouts) if self.recent_breakouts else 0
         
         return {
-            "total_signals": len(self.signal_history),
+            "total_signals": self._signal_count,
             "total_trades": total_trades,
             "win_rate": round(win_rate, 3),
             "breakout_success_rate": round(success_rate, 3),
             "current_threshold": round(self.dynamic_threshold, 6),
             "breakout_strength": round(self.breakout_strength, 2),
-            "avg_profit": round(np.mean(self.performance_history) if self.performance_history else 0, 4),
+            "avg_profit": round(avg_profit, 4),
             "breakout_types": breakout_types,
-            "recent_performance": self.performance_history[-8:] if len(self.performance_history) >= 8 else self.performance_history
+            "recent_performance": list(islice(self.performance_history, max(0, len(self.performance_history) - 8), None))
         }
\ No newline at end of file
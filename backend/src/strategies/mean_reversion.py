@@ -1,9 +1,24 @@
 # backend/src/strategies/mean_reversion.py
 from .base_strategy import BaseStrategy
-from src.indicators.technical import ema, bollinger_bands
 from typing import Dict, List, Tuple
+import math
 import numpy as np
 from src.utils.logger import logger
+from src.core.tick import Tick
+from src.indicators.kernels import new_state, ema_bb_step
+
+PERF_HISTORY_SIZE = 150
+SIGNAL_HISTORY_SIZE = 200
+PRICE_WINDOW = 150
+SIGNAL_TYPES = ("ema_bb_confirmation", "ema_reversion", "bollinger")
+_SIGNAL_TYPE_CODES = {t: i for i, t in enumerate(SIGNAL_TYPES)}
+
+# Bollinger band position codes
+BAND_NONE = 0
+BAND_UPPER = 1
+BAND_LOWER = 2
+BAND_MIDDLE_UP = 3
+BAND_MIDDLE_DOWN = 4
 
 class MeanReversionStrategy(BaseStrategy):
     name = "mean_reversion"
@@ -24,13 +39,8 @@ class MeanReversionStrategy(BaseStrategy):
         self.reversal_threshold = float(reversal_threshold)
         self.optimize = bool(optimize)
 
-        self.prices: List[float] = []
-        self.performance_history: List[float] = []
-        self.signal_history: List[Dict] = []
-
-        # Adaptive parameters - BALANCED (not too conservative)
-        self.dynamic_threshold = self.reversal_threshold
-        self.volatility_adjustment = 1.0
+        self._min_prices = max(self.ema_long, self.bb_period, 2)
+        self.reset()
 
         if self.optimize:
             try:
@@ -38,16 +48,47 @@ class MeanReversionStrategy(BaseStrategy):
             except Exception:
                 logger.exception("MeanReversion: initial optimization failed")
 
+    def reset(self):
+        """Clear all tick, signal and trade state, keeping the configuration"""
+        # float64 price window; twice the size and compacted when full so
+        # the tail is always a contiguous view. `_price_head` doubles as the
+        # price count for the warm-up checks (all well below PRICE_WINDOW)
+        self._price_arr = np.empty(2 * PRICE_WINDOW, dtype=np.float64)
+        self._price_head = 0
+        # Trade profits in a fixed-size ring buffer
+        self._perf = np.empty(PERF_HISTORY_SIZE, dtype=np.float64)
+        self._perf_head = 0  # total results recorded
+        self._perf_count = 0  # valid entries in the ring
+
+        # Signal history as parallel column ring buffers (one slot per signal)
+        self._sig_side = np.empty(SIGNAL_HISTORY_SIZE, dtype='U4')
+        self._sig_score = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.float64)
+        self._sig_type = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.int8)
+        self._sig_ratio = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.float64)
+        self._sig_price = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.float64)
+        self._sig_ts = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.float64)
+        self._sig_head = 0  # total signals recorded
+
+        # Adaptive parameters - BALANCED (not too conservative)
+        self.dynamic_threshold = self.reversal_threshold
+        self.volatility_adjustment = 1.0
+
+        # EMA + Bollinger state advanced by the indicator kernel
+        self._ind_state, self._bb_ring = new_state(
+            self.ema_short, self.ema_long, self.bb_period, self.bb_std
+        )
+
     def _optimize_parameters(self):
         """Optimize parameters based on market conditions and performance"""
-        if len(self.prices) < 30 or len(self.performance_history) < 5:
+        if self._price_head < 30 or self._perf_count < 5:
             return
 
         try:
             # Calculate recent volatility
-            recent_prices = self.prices[-15:]
-            returns = [recent_prices[i] / recent_prices[i - 1] - 1 for i in range(1, len(recent_prices))]
-            volatility = np.std(returns) if returns else 0.001
+            head = self._price_head
+            recent_prices = self._price_arr[max(0, head - 15):head]
+            returns = recent_prices[1:] / recent_prices[:-1] - 1
+            volatility = returns.std() if returns.size else 0.001
 
             # Adjust threshold based on volatility - BALANCED
             self.volatility_adjustment = max(0.8, min(1.5, volatility * 800))
@@ -56,9 +97,9 @@ class MeanReversionStrategy(BaseStrategy):
             self.dynamic_threshold = max(0.0003, min(0.003, volatility * 1.2))
 
             # Performance-based optimization
-            recent_performance = self.performance_history[-10:]
-            if recent_performance:
-                win_rate = sum(1 for p in recent_performance if p > 0) / len(recent_performance)
+            recent_performance = self._recent(10)
+            if recent_performance.size:
+                win_rate = (recent_performance > 0).mean()
 
                 if win_rate < 0.35:
                     # Increase threshold slightly to reduce false signals
@@ -74,188 +115,182 @@ class MeanReversionStrategy(BaseStrategy):
         except Exception as e:
             logger.error(f"MeanReversion optimization error: {e}")
 
-    def _calculate_bollinger_signal(self, prices: List[float]) -> Dict:
-        """Calculate Bollinger Bands signals (robust unpacking)"""
-        result: Dict = {}
-
-        if len(prices) < self.bb_period:
-            return result
-
-        bb = bollinger_bands(prices, self.bb_period, self.bb_std)
-        if not bb:
-            return result
+    def _recent(self, n: int) -> np.ndarray:
+        """Last `n` recorded profits, oldest first (a view unless the ring wrapped)"""
+        n = min(n, self._perf_count)
+        end = self._perf_head % PERF_HISTORY_SIZE
+        start = end - n
+        if start >= 0:
+            return self._perf[start:end]
+        return np.concatenate((self._perf[start:], self._perf[:end]))
+
+    @property
+    def performance_history(self) -> List[float]:
+        """Retained profits as a list (for cold-path callers)"""
+        return self._recent(PERF_HISTORY_SIZE).tolist()
+
+    def _record_signal(self, epoch, side: str, score: float, signal_type: str, ratio: float, price: float):
+        """Write one signal into the column ring buffers"""
+        i = self._sig_head % SIGNAL_HISTORY_SIZE
+        self._sig_side[i] = side
+        self._sig_score[i] = score
+        self._sig_type[i] = _SIGNAL_TYPE_CODES[signal_type]
+        self._sig_ratio[i] = ratio
+        self._sig_price[i] = price
+        self._sig_ts[i] = epoch if epoch is not None else np.nan
+        self._sig_head += 1
+
+    def _recent_signal_index(self, n: int) -> np.ndarray:
+        """Ring positions of the last `n` recorded signals, oldest first"""
+        head = self._sig_head
+        n = min(n, head, SIGNAL_HISTORY_SIZE)
+        return np.arange(head - n, head) % SIGNAL_HISTORY_SIZE
+
+    @property
+    def signal_history(self) -> List[Dict]:
+        """Retained signals as dicts (rebuilt on demand, not on the hot path)"""
+        history = []
+        for i in self._recent_signal_index(SIGNAL_HISTORY_SIZE):
+            ts = self._sig_ts[i]
+            history.append({
+                "timestamp": None if np.isnan(ts) else int(ts),
+                "side": str(self._sig_side[i]),
+                "score": float(self._sig_score[i]),
+                "signal_type": SIGNAL_TYPES[self._sig_type[i]],
+                "price_ema_ratio": float(self._sig_ratio[i]),
+                "price": float(self._sig_price[i])
+            })
+        return history
+
+    def _push_price(self, price: float):
+        """Append a price to the float64 window, compacting it when full"""
+        arr = self._price_arr
+        if self._price_head == arr.shape[0]:
+            arr[:PRICE_WINDOW] = arr[-PRICE_WINDOW:]
+            self._price_head = PRICE_WINDOW
+        arr[self._price_head] = price
+        self._price_head += 1
+
+    def on_tick(self, tick: Tick):
+        price = tick.quote
+        self._push_price(price)
+        (short_ema, long_ema, bb_upper, bb_lower, bb_middle,
+         bb_middle_prev) = ema_bb_step(self._ind_state, self._bb_ring, price)
 
-        # bb is a list of tuples: [(upper, middle, lower), ...]
-        try:
-            # unzip into three sequences
-            uppers, middles, lowers = zip(*bb)
-        except Exception:
-            # defensive fallback: if structure unexpected, try to read last tuple only
-            try:
-                last = bb[-1]
-                if len(last) >= 3:
-                    upper_last, middle_last, lower_last = last[0], last[1], last[2]
-                    uppers, middles, lowers = ( (upper_last,), (middle_last,), (lower_last,) )
-                else:
-                    return result
-            except Exception:
-                return result
+        # Need enough data for calculations
+        if self._price_head < self._min_prices:
+            return None
 
-        # safe access to last and previous elements
-        upper_last = uppers[-1]
-        middle_last = middles[-1]
-        lower_last = lowers[-1]
+        if math.isnan(short_ema) or math.isnan(long_ema):
+            return None
 
-        # compute previous middle when available
-        middle_prev = middles[-2] if len(middles) >= 2 else middle_last
-        # current price
-        current_price = prices[-1]
+        # Bollinger band position from the kernel's band values
+        if math.isnan(bb_middle_prev):
+            bb_middle_prev = bb_middle
+        prev_price = self._price_arr[self._price_head - 2]
 
         # Price near upper band -> potential reversal down → FALL signal
         # Use 99% of band for better sensitivity
-        if current_price >= upper_last * 0.99:
-            result["side"] = "FALL"
-            result["strength"] = 0.75  # Reduced from 0.8
-            result["band_position"] = "upper"
+        if price >= bb_upper * 0.99:
+            bb_pos, bb_side, bb_strength = BAND_UPPER, "FALL", 0.75  # Reduced from 0.8
 
         # Price near lower band -> potential reversal up → RISE signal
-        elif current_price <= lower_last * 1.01:
-            result["side"] = "RISE"
-            result["strength"] = 0.75  # Reduced from 0.8
-            result["band_position"] = "lower"
+        elif price <= bb_lower * 1.01:
+            bb_pos, bb_side, bb_strength = BAND_LOWER, "RISE", 0.75  # Reduced from 0.8
 
         # Price crossing middle band upward → RISE signal
-        elif (len(prices) >= 2) and (prices[-2] < middle_prev and current_price > middle_last):
-            result["side"] = "RISE"
-            result["strength"] = 0.6
-            result["band_position"] = "middle_up"
+        elif prev_price < bb_middle_prev and price > bb_middle:
+            bb_pos, bb_side, bb_strength = BAND_MIDDLE_UP, "RISE", 0.6
 
         # Price crossing middle band downward → FALL signal
-        elif (len(prices) >= 2) and (prices[-2] > middle_prev and current_price < middle_last):
-            result["side"] = "FALL"
-            result["strength"] = 0.6
-            result["band_position"] = "middle_down"
-
-        return result
-
-    def on_tick(self, tick: Dict):
-        price = float(tick["quote"])
-        self.prices.append(price)
-
-        # Maintain reasonable data size
-        if len(self.prices) > 150:
-            self.prices = self.prices[-150:]
-
-        # Need enough data for calculations
-        if len(self.prices) < max(self.ema_long, self.bb_period):
-            return None
-
-        # Calculate EMAs
-        es = ema(self.prices, self.ema_short)
-        el = ema(self.prices, self.ema_long)
-        if not es or not el:
-            return None
-
-        short_ema = es[-1]
-        long_ema = el[-1]
+        elif prev_price > bb_middle_prev and price < bb_middle:
+            bb_pos, bb_side, bb_strength = BAND_MIDDLE_DOWN, "FALL", 0.6
 
-        # Calculate Bollinger Bands signal
-        bb_signal = self._calculate_bollinger_signal(self.prices)
-
-        # Enhanced mean reversion logic
-        signals: List[tuple] = []
+        else:
+            bb_pos, bb_side, bb_strength = BAND_NONE, None, 0.0
 
         # price to long ratio
         price_to_long_ratio = (price - long_ema) / long_ema if long_ema != 0 else 0.0
 
+        # Enhanced mean reversion logic - the chain yields at most one signal
         # Strong FALL signal: Price significantly above long EMA + Bollinger upper band
         if (price_to_long_ratio > self.dynamic_threshold and
-            bb_signal.get("band_position") in ["upper", "middle_down"]):
-            strength = bb_signal.get("strength", 0.7) + 0.1
-            signals.append(("FALL", strength, "ema_bb_confirmation"))
+            (bb_pos == BAND_UPPER or bb_pos == BAND_MIDDLE_DOWN)):
+            side, strength, signal_type = "FALL", bb_strength + 0.1, "ema_bb_confirmation"
 
         # Strong RISE signal: Price significantly below long EMA + Bollinger lower band
         elif (price_to_long_ratio < -self.dynamic_threshold and
-              bb_signal.get("band_position") in ["lower", "middle_up"]):
-            strength = bb_signal.get("strength", 0.7) + 0.1
-            signals.append(("RISE", strength, "ema_bb_confirmation"))
+              (bb_pos == BAND_LOWER or bb_pos == BAND_MIDDLE_UP)):
+            side, strength, signal_type = "RISE", bb_strength + 0.1, "ema_bb_confirmation"
 
         # Standard EMA mean reversion - BALANCED thresholds
         elif price_to_long_ratio > self.dynamic_threshold:
-            signals.append(("FALL", 0.65, "ema_reversion"))  # Increased from 0.6
+            side, strength, signal_type = "FALL", 0.65, "ema_reversion"  # Increased from 0.6
 
         elif price_to_long_ratio < -self.dynamic_threshold:
-            signals.append(("RISE", 0.65, "ema_reversion"))  # Increased from 0.6
+            side, strength, signal_type = "RISE", 0.65, "ema_reversion"  # Increased from 0.6
 
         # Bollinger Band standalone signals (strong ones only)
-        elif bb_signal and bb_signal.get("strength", 0) >= 0.7:  # Reduced from 0.8
-            signals.append((bb_signal["side"], bb_signal["strength"], "bollinger"))
-
-        # Take the strongest signal
-        if signals:
-            # Sort by strength and take the strongest
-            signals.sort(key=lambda x: x[1], reverse=True)
-            side, strength, signal_type = signals[0]
-
-            # Store signal for tracking
-            self.signal_history.append({
-                "timestamp": tick.get("epoch"),
-                "side": side,
-                "score": strength,
-                "signal_type": signal_type,
-                "price_ema_ratio": price_to_long_ratio,
-                "price": price
-            })
+        elif bb_pos != BAND_NONE and bb_strength >= 0.7:  # Reduced from 0.8
+            side, strength, signal_type = bb_side, bb_strength, "bollinger"
 
-            return {
-                "side": side,
-                "score": strength,
-                "meta": {
-                    "price_ema_ratio": round(price_to_long_ratio, 6),
-                    "signal_type": signal_type,
-                    "dynamic_threshold": self.dynamic_threshold,
-                    "volatility_adjustment": self.volatility_adjustment,
-                    "strategy": self.name
-                }
-            }
+        else:
+            return None
 
-        return None
+        # Store signal for tracking
+        self._record_signal(tick.epoch, side, strength, signal_type, price_to_long_ratio, price)
+
+        return {
+            "side": side,
+            "score": strength,
+            "meta": {
+                "price_ema_ratio": round(price_to_long_ratio, 6),
+                "signal_type": signal_type,
+                "dynamic_threshold": self.dynamic_threshold,
+                "volatility_adjustment": self.volatility_adjustment,
+                "strategy": self.name
+            }
+        }
 
     def update_performance(self, trade_result: str, profit: float):
         """Update strategy performance for optimization"""
         try:
-            self.performance_history.append(float(profit))
-            # keep bounded history
-            if len(self.performance_history) > 150:
-                self.performance_history = self.performance_history[-150:]
-            if self.optimize and len(self.performance_history) % 3 == 0:  # More frequent optimization
+            profit = float(profit)
+            self._perf[self._perf_head % PERF_HISTORY_SIZE] = profit
+            self._perf_head += 1
+            self._perf_count = min(self._perf_count + 1, PERF_HISTORY_SIZE)
+            # Check the optimizer's preconditions here to skip the call when it would no-op
+            if (self.optimize and self._perf_count % 3 == 0  # More frequent optimization
+                    and self._perf_count >= 5 and self._price_head >= 30):
                 self._optimize_parameters()
         except Exception:
             logger.exception("MeanReversion.update_performance failed")
 
     def get_strategy_metrics(self) -> Dict:
         """Get strategy performance metrics"""
-        if not self.performance_history:
+        if not self._perf_count:
             return {}
 
-        wins = sum(1 for p in self.performance_history if p > 0)
-        losses = sum(1 for p in self.performance_history if p < 0)
-        total_trades = len(self.performance_history)
-        win_rate = wins / total_trades if total_trades > 0 else 0
+        # Win rate and average profit cover the retained window; the trade
+        # count is lifetime
+        perf = self._recent(PERF_HISTORY_SIZE)
+        wins = int((perf > 0).sum())
+        losses = int((perf < 0).sum())
+        win_rate = wins / perf.size if perf.size > 0 else 0
 
         # Analyze signal types
-        signal_types: Dict[str, int] = {}
-        for signal in self.signal_history[-50:]:
-            sig_type = signal.get("signal_type", "unknown")
-            signal_types[sig_type] = signal_types.get(sig_type, 0) + 1
+        type_counts = np.bincount(self._sig_type[self._recent_signal_index(50)], minlength=len(SIGNAL_TYPES))
+        signal_types: Dict[str, int] = {
+            SIGNAL_TYPES[code]: int(count) for code, count in enumerate(type_counts) if count
+        }
 
         return {
-            "total_signals": len(self.signal_history),
-            "total_trades": total_trades,
+            "total_signals": self._sig_head,
+            "total_trades": self._perf_head,
             "win_rate": round(win_rate, 3),
             "current_threshold": round(self.dynamic_threshold, 6),
             "volatility_adjustment": round(self.volatility_adjustment, 3),
-            "avg_profit": round(np.mean(self.performance_history) if self.performance_history else 0, 4),
+            "avg_profit": round(float(perf.mean()), 4),
             "signal_types": signal_types,
-            "recent_performance": self.performance_history[-10:] if len(self.performance_history) >= 10 else self.performance_history
+            "recent_performance": self._recent(10).tolist()
         }
\ No newline at end of file
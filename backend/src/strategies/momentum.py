@@ -1,10 +1,16 @@
 # backend/src/strategies/momentum.py
 from .base_strategy import BaseStrategy
-from src.indicators.technical import rsi, ema, macd
+from collections import deque
+from itertools import islice
+import math
 from typing import Dict, List
 import numpy as np
 from src.utils.logger import logger
+from src.core.tick import Tick
+from src.indicators.kernels import new_state, rsi_macd_step
 
+PERF_HISTORY_SIZE = 150
+SIGNAL_HISTORY_SIZE = 200
 
 class MomentumStrategy(BaseStrategy):
     name = "momentum"
@@ -27,31 +33,59 @@ class MomentumStrategy(BaseStrategy):
         self.macd_signal = macd_signal
         self.optimize = optimize
 
-        self.prices: List[float] = []
-        self.performance_history = []
-        self.signal_history = []
+        self._macd_min_prices = macd_slow + 10
+        self._divergence_min_prices = rsi_period + 5
+        self.reset()
+
+        if optimize:
+            self._optimize_parameters()
+
+    def reset(self):
+        """Clear all tick, signal and trade state, keeping the configuration"""
+        # Bounded price window - deque drops the oldest price in O(1)
+        self.prices = deque(maxlen=120)
+        # Trade profits in a fixed-size ring buffer
+        self._perf = np.empty(PERF_HISTORY_SIZE, dtype=np.float64)
+        self._perf_head = 0  # total results recorded
+        self._perf_count = 0  # valid entries in the ring
+        # Lifetime totals for the metrics (the ring only keeps the tail)
+        self._win_count = 0
+        self._profit_total = 0.0
         self.parameter_history = []
 
+        # Signal history as parallel column ring buffers (one slot per signal)
+        self._sig_side = np.empty(SIGNAL_HISTORY_SIZE, dtype="U4")
+        self._sig_score = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.float64)
+        self._sig_rsi = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.float64)
+        self._sig_macd = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.float64)
+        self._sig_price = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.float64)
+        self._sig_ts = np.empty(SIGNAL_HISTORY_SIZE, dtype=np.float64)
+        self._sig_head = 0  # total signals recorded
+
         # -------------------------------------------------
         # ADAPTIVE THRESHOLDS (MORE RESPONSIVE)
         # -------------------------------------------------
         self.dynamic_overbought = 65  # tighter, earlier reaction
         self.dynamic_oversold = 35
 
-        if optimize:
-            self._optimize_parameters()
+        # RSI + MACD state advanced by the indicator kernel (no Bollinger ring)
+        self._ind_state, _ = new_state(
+            rsi_period=self.rsi_period,
+            macd_fast=self.macd_fast,
+            macd_slow=self.macd_slow,
+            macd_signal=self.macd_signal,
+        )
 
     # -----------------------------------------------------
     # PARAMETER OPTIMIZATION
     # -----------------------------------------------------
     def _optimize_parameters(self):
         """Optimize RSI parameters based on recent performance"""
-        if len(self.performance_history) < 15:
+        if self._perf_count < 15:
             return
 
         try:
-            recent = self.performance_history[-15:]
-            win_rate = sum(1 for p in recent if p > 0) / len(recent)
+            win_rate = (self._recent(15) > 0).mean()
 
             if win_rate < 0.35:
                 # Losing → tighten, reduce overtrading
@@ -75,48 +109,76 @@ class MomentumStrategy(BaseStrategy):
             logger.error(f"Momentum optimization error: {e}")
 
     # -----------------------------------------------------
-    # MACD CONFIRMATION
+    # PERFORMANCE HISTORY
     # -----------------------------------------------------
-    def _calculate_macd_signal(self, prices: List[float]) -> float:
-        if len(prices) < self.macd_slow + 10:
-            return 0.0
-
-        macd_result = macd(
-            prices,
-            self.macd_fast,
-            self.macd_slow,
-            self.macd_signal,
-        )
+    def _recent(self, n: int) -> np.ndarray:
+        """Last `n` recorded profits, oldest first (a view unless the ring wrapped)"""
+        n = min(n, self._perf_count)
+        end = self._perf_head % PERF_HISTORY_SIZE
+        start = end - n
+        if start >= 0:
+            return self._perf[start:end]
+        return np.concatenate((self._perf[start:], self._perf[:end]))
+
+    @property
+    def performance_history(self) -> List[float]:
+        """Retained profits as a list (for cold-path callers)"""
+        return self._recent(PERF_HISTORY_SIZE).tolist()
 
-        if not macd_result:
-            return 0.0
-
-        return macd_result[-1][0]  # MACD line
+    # -----------------------------------------------------
+    # SIGNAL HISTORY
+    # -----------------------------------------------------
+    def _record_signal(self, epoch, side: str, score: float, rsi_value: float, macd_value: float, price: float):
+        """Write one signal into the column ring buffers"""
+        i = self._sig_head % SIGNAL_HISTORY_SIZE
+        self._sig_side[i] = side
+        self._sig_score[i] = score
+        self._sig_rsi[i] = rsi_value
+        self._sig_macd[i] = macd_value
+        self._sig_price[i] = price
+        self._sig_ts[i] = epoch if epoch is not None else np.nan
+        self._sig_head += 1
+
+    def _recent_signal_index(self, n: int) -> np.ndarray:
+        """Ring positions of the last `n` recorded signals, oldest first"""
+        head = self._sig_head
+        n = min(n, head, SIGNAL_HISTORY_SIZE)
+        return np.arange(head - n, head) % SIGNAL_HISTORY_SIZE
+
+    @property
+    def signal_history(self) -> List[Dict]:
+        """Retained signals as dicts (rebuilt on demand, not on the hot path)"""
+        history = []
+        for i in self._recent_signal_index(SIGNAL_HISTORY_SIZE):
+            ts = self._sig_ts[i]
+            history.append({
+                "timestamp": None if np.isnan(ts) else int(ts),
+                "side": str(self._sig_side[i]),
+                "score": float(self._sig_score[i]),
+                "rsi": float(self._sig_rsi[i]),
+                "macd": float(self._sig_macd[i]),
+                "price": float(self._sig_price[i]),
+            })
+        return history
 
     # -----------------------------------------------------
     # TICK HANDLER
     # -----------------------------------------------------
-    def on_tick(self, tick: Dict):
-        price = float(tick["quote"])
+    def on_tick(self, tick: Tick):
+        price = tick.quote
         self.prices.append(price)
 
-        if len(self.prices) > 120:
-            self.prices = self.prices[-120:]
-
-        if len(self.prices) < self.rsi_period + 1:
-            return None
+        latest_rsi, prev_rsi, macd_line = rsi_macd_step(self._ind_state, price)
 
-        rsivals = rsi(self.prices, self.rsi_period)
-        if not rsivals:
+        if math.isnan(latest_rsi):
             return None
+        # MACD confirmation only once enough history has built up
+        macd_signal = macd_line if len(self.prices) >= self._macd_min_prices else 0.0
 
-        latest_rsi = rsivals[-1]
-        macd_signal = self._calculate_macd_signal(self.prices)
-
+        # %-style args: formatting is skipped unless DEBUG is enabled
         logger.debug(
-            f"Momentum RSI={latest_rsi:.2f} "
-            f"MACD={macd_signal:.4f} "
-            f"Price={price}"
+            "Momentum RSI=%.2f MACD=%.4f Price=%s",
+            latest_rsi, macd_signal, price
         )
 
         signal_strength = 0.0
@@ -147,25 +209,19 @@ class MomentumStrategy(BaseStrategy):
         # -------------------------------------------------
         # SENSITIVE DIVERGENCE DETECTION (UPDATED)
         # -------------------------------------------------
-        elif len(rsivals) >= 5:
+        elif len(self.prices) >= self._divergence_min_prices:
+            # Bind every comparand once; the window is always 5 prices here
+            prev_price = self.prices[-2]
+            mean5 = sum(islice(self.prices, len(self.prices) - 5, None)) / 5
+
             # Bearish divergence → FALL
-            if (
-                price > self.prices[-2]
-                and latest_rsi < rsivals[-2]
-                and latest_rsi > 55
-                and price > np.mean(self.prices[-5:])
-            ):
+            if (price > prev_price) & (latest_rsi < prev_rsi) & (latest_rsi > 55.0) & (price > mean5):
                 side = "FALL"
                 signal_strength = 0.65
                 logger.debug("Momentum: Bearish divergence detected")
 
             # Bullish divergence → RISE
-            elif (
-                price < self.prices[-2]
-                and latest_rsi > rsivals[-2]
-                and latest_rsi < 45
-                and price < np.mean(self.prices[-5:])
-            ):
+            elif (price < prev_price) & (latest_rsi > prev_rsi) & (latest_rsi < 45.0) & (price < mean5):
                 side = "RISE"
                 signal_strength = 0.65
                 logger.debug("Momentum: Bullish divergence detected")
@@ -173,19 +229,11 @@ class MomentumStrategy(BaseStrategy):
         if not side:
             return None
 
-        self.signal_history.append({
-            "timestamp": tick.get("epoch"),
-            "side": side,
-            "score": signal_strength,
-            "rsi": latest_rsi,
-            "macd": macd_signal,
-            "price": price,
-        })
+        self._record_signal(tick.epoch, side, signal_strength, latest_rsi, macd_signal, price)
 
         logger.info(
-            f"Momentum signal → {side} "
-            f"score={signal_strength:.2f} "
-            f"RSI={latest_rsi:.2f}"
+            "Momentum signal → %s score=%.2f RSI=%.2f",
+            side, signal_strength, latest_rsi
         )
 
         return {
@@ -203,29 +251,42 @@ class MomentumStrategy(BaseStrategy):
     # PERFORMANCE FEEDBACK
     # -----------------------------------------------------
     def update_performance(self, trade_result: str, profit: float):
-        self.performance_history.append(profit)
-
-        if self.optimize and len(self.performance_history) % 8 == 0:
+        self._perf[self._perf_head % PERF_HISTORY_SIZE] = profit
+        self._perf_head += 1
+        self._perf_count = min(self._perf_count + 1, PERF_HISTORY_SIZE)
+        self._profit_total += profit
+        if profit > 0:
+            self._win_count += 1
+
+        # Check the optimizer's precondition here to skip the call when it would no-op
+        if self.optimize and self._perf_head % 8 == 0 and self._perf_count >= 15:
             self._optimize_parameters()
 
     # -----------------------------------------------------
     # METRICS
     # -----------------------------------------------------
     def get_strategy_metrics(self) -> Dict:
-        if not self.performance_history:
+        if not self._perf_count:
             return {}
 
-        wins = sum(1 for p in self.performance_history if p > 0)
-        total = len(self.performance_history)
-        win_rate = wins / total if total else 0.0
+        # Lifetime figures from the running totals
+        total = self._perf_head
+        win_rate = self._win_count / total
+
+        # Signals where MACD agreed with the RSI direction
+        sel = self._recent_signal_index(SIGNAL_HISTORY_SIZE)
+        side = self._sig_side[sel]
+        macd_values = self._sig_macd[sel]
+        macd_confirmed = int(
+            (((side == "FALL") & (macd_values < 0)) | ((side == "RISE") & (macd_values > 0))).sum()
+        )
 
         return {
-            "total_signals": len(self.signal_history),
+            "total_signals": self._sig_head,
+            "macd_confirmed_signals": macd_confirmed,
             "total_trades": total,
             "win_rate": round(win_rate, 3),
             "current_thresholds": f"{self.dynamic_overbought}/{self.dynamic_oversold}",
-            "avg_profit": round(
-                float(np.mean(self.performance_history)), 4
-            ) if self.performance_history else 0.0,
-            "recent_performance": self.performance_history[-10:],
+            "avg_profit": round(self._profit_total / total, 4),
+            "recent_performance": self._recent(10).tolist(),
         }
@@ -1,9 +1,14 @@
 # backend/src/test_signal.py
 import sys
 import os
-import random
+import functools
 import time
-from typing import List, Dict
+import logging
+import multiprocessing
+from typing import Dict, List, Optional
+
+import numpy as np
+import pytest
 
 # Add the src directory to the path so we can import modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -12,88 +17,185 @@ from src.strategies.mean_reversion import MeanReversionStrategy
 from src.strategies.momentum import MomentumStrategy
 from src.strategies.breakout import BreakoutStrategy
 from src.core.signal_consensus import SignalConsensus
+from src.core.tick import Tick
+from src.indicators.kernels import warm_up
 from src.config.settings import settings
 from src.utils.logger import logger
+from src.utils.jit import njit
+
+# Per-tick and per-trade output is logged at DEBUG, enabled with TEST_VERBOSE
+DEBUG = os.environ.get('TEST_VERBOSE')
+TEST_LOG_LEVEL = logging.DEBUG if DEBUG else logging.INFO
+
+# Seeded generator so the fake ticks and trade outcomes are reproducible
+rng = np.random.default_rng(42)
+
+# One record per fake tick: 16 bytes instead of a 3-key dict
+TICK_DTYPE = np.dtype([('quote', 'f8'), ('epoch', 'i8')])
 
-def generate_fake_ticks(base_price: float = 100.0, num_ticks: int = 50) -> List[Dict]:
-    """Generate fake tick data for testing"""
-    ticks = []
+@njit(cache=True)
+def _walk(base_price: float, deltas: np.ndarray) -> np.ndarray:
+    """Random walk from base_price, clamped to 50-150 after every step"""
+    prices = np.empty(deltas.shape[0])
     price = base_price
+    for i in range(deltas.shape[0]):
+        price += deltas[i]
+        if price < 50.0:
+            price = 50.0
+        elif price > 150.0:
+            price = 150.0
+        prices[i] = price
+    return prices
+
+def generate_fake_ticks(base_price: float = 100.0, num_ticks: int = 50,
+                        generator: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Generate fake tick data for testing (structured array, symbol is settings.SYMBOL)"""
+    deltas = (generator or rng).uniform(-0.5, 0.5, num_ticks)
     
-    for i in range(num_ticks):
-        # Simulate some price movement
-        change = random.uniform(-0.5, 0.5)
-        price += change
-        price = max(50.0, min(150.0, price))  # Keep within bounds
-        
-        tick = {
-            "quote": round(price, 4),
-            "symbol": settings.SYMBOL,
-            "epoch": int(time.time()) + i
-        }
-        ticks.append(tick)
-    
+    ticks = np.empty(num_ticks, dtype=TICK_DTYPE)
+    ticks['quote'] = _walk(base_price, deltas).round(4)  # Keep within bounds
+    ticks['epoch'] = np.arange(num_ticks, dtype=np.int64) + int(time.time())
     return ticks
 
-def simulate_trade_outcome(consensus_score: float) -> bool:
+# Consensus side codes used by the replay kernel
+SIDE_NONE = 0
+SIDE_RISE = 1
+SIDE_FALL = -1
+_SIDE_CODES = {"RISE": SIDE_RISE, "FALL": SIDE_FALL}
+
+# Win probability per consensus score, quantized to 256 steps over [0, 1]
+# Score 1.0 -> 80% win; Score 0.6 -> 56% win
+_WIN_LUT = 0.5 + (np.arange(256) / 255.0 - 0.5) * 0.6
+
+@njit(cache=True)
+def simulate_trade_outcome(consensus_score: float, draw: float) -> bool:
     """Simulate win/loss based on consensus score (higher score = higher win chance)"""
-    win_probability = 0.5 + (consensus_score - 0.5) * 0.6  # Score 1.0 -> 80% win; Score 0.6 -> 56% win
-    return random.random() < win_probability
+    return draw < _WIN_LUT[min(255, max(0, int(consensus_score * 255)))]
 
-def test_signal_generation():
-    """Test signal generation from all strategies with trade simulation"""
-    print("=== SIGNAL GENERATION & TRADE SIMULATION TEST ===")
-    
-    # Initialize strategies
-    strategies = [
-        MeanReversionStrategy(optimize=False),  # Disable optimization for testing
+@njit(cache=True)
+def _replay(quotes, sides, scores, draws, duration, stake, payout_rate=0.82):
+    """Replay the consensus sides tick by tick, opening and expiring positions.
+
+    Positions live in a ring of (duration + 1) rows of
+    (exit_tick, entry_tick, score), keyed by exit_tick % (duration + 1);
+    exit_tick -1 marks a free slot. With at most one entry per tick and a fixed
+    horizon, tick i only ever has to check slot i % (duration + 1).
+    Closed trades are written to (entry_tick, exit_tick, profit, won) rows so the
+    caller can report them. Positions still open at the end are returned.
+    """
+    n = quotes.shape[0]
+    ring_size = duration + 1
+    positions = np.full((ring_size, 3), -1.0)
+    closed = np.empty((n, 4))
+    n_closed = 0
+    wins = 0
+    losses = 0
+    net_profit = 0.0
+
+    for i in range(n):
+        # Close the position expiring on this tick, if any
+        slot = i % ring_size
+        if positions[slot, 0] >= 0:
+            is_win = simulate_trade_outcome(positions[slot, 2], draws[n_closed])
+            payout = stake * payout_rate if is_win else 0.0  # Deriv payout approximation
+            profit = payout - stake
+            if is_win:
+                wins += 1
+            else:
+                losses += 1
+            net_profit += profit
+            closed[n_closed, 0] = positions[slot, 1]
+            closed[n_closed, 1] = i
+            closed[n_closed, 2] = profit
+            closed[n_closed, 3] = is_win
+            n_closed += 1
+            positions[slot, 0] = -1.0
+
+        # Simulate trade entry
+        if sides[i] != 0:
+            slot = (i + duration) % ring_size
+            positions[slot, 0] = i + duration
+            positions[slot, 1] = i
+            positions[slot, 2] = scores[i]
+
+    return wins, losses, net_profit, closed[:n_closed], positions
+
+def _warm_up_kernels():
+    """Compile the njit kernels up front on throwaway inputs.
+
+    With cache=True the machine code is also written to __pycache__, so later
+    runs only pay the cache load.
+    """
+    warm_up()
+    _walk(100.0, np.zeros(1))
+    _replay(np.full(1, 100.0), np.zeros(1, dtype=np.int8), np.zeros(1), np.zeros(1), 1, 1.0)
+
+@functools.lru_cache(maxsize=1)
+def _get_strategies():
+    """Strategies (optimization disabled for testing) and consensus, built once"""
+    strategies = (
+        MeanReversionStrategy(optimize=False),
         MomentumStrategy(optimize=False),
         BreakoutStrategy(optimize=False)
-    ]
-    
-    # Initialize consensus
-    consensus = SignalConsensus()
+    )
+    return strategies, SignalConsensus()
+
+@pytest.fixture(autouse=True)
+def _test_log_level():
+    """Apply TEST_LOG_LEVEL for the test only, then restore the app's level"""
+    previous = logger.level
+    logger.setLevel(TEST_LOG_LEVEL)
+    yield
+    logger.setLevel(previous)
+
+@pytest.fixture(scope="module")
+def warmed_strategies():
+    """Shared strategies and consensus, with the kernels compiled"""
+    _warm_up_kernels()
+    return _get_strategies()
+
+# Default replay configuration; sweep configs override any of these keys
+DEFAULT_CONFIG = {
+    'base_price': 100.0,
+    'num_ticks': 100,
+    'contract_duration_ticks': 5,  # Simulate 5 ticks for expiry
+    'stake': 1.0,  # Fixed stake per trade (matches TRADE_AMOUNT)
+}
+
+def run_once(cfg: Dict, strategies=None, consensus=None) -> Dict:
+    """Generate ticks, run the signal pass and replay the trades for one config.
+
+    `cfg` may also carry a `seed` for a private generator (used by sweeps so
+    results do not depend on which worker ran the config).
+    """
+    cfg = {**DEFAULT_CONFIG, **cfg}
+    if strategies is None:
+        strategies, consensus = _get_strategies()
+    for strategy in strategies:
+        strategy.reset()
+    generator = np.random.default_rng(cfg['seed']) if 'seed' in cfg else rng
     
     # Generate fake tick data
-    ticks = generate_fake_ticks(base_price=100.0, num_ticks=100)
-    print(f"Generated {len(ticks)} fake ticks")
+    ticks = generate_fake_ticks(base_price=cfg['base_price'], num_ticks=cfg['num_ticks'],
+                                generator=generator)
     
-    all_signals = []
-    open_positions = {}  # tick_index -> {'side': str, 'entry_price': float, 'exit_tick': int}
-    total_trades = 0
-    wins = 0
-    losses = 0
-    net_profit = 0.0
-    stake = 1.0  # Fixed stake per trade (matches TRADE_AMOUNT)
-    contract_duration_ticks = 5  # Simulate 5 ticks for expiry
+    # At most one consensus signal per tick, so size the list up front
+    all_signals = [None] * len(ticks)
+    sig_count = 0
+    quotes = ticks['quote']
+    sides = np.zeros(len(ticks), dtype=np.int8)
+    scores = np.zeros(len(ticks), dtype=np.float64)
+    stake = cfg['stake']
+    contract_duration_ticks = cfg['contract_duration_ticks']
     
-    # Process each tick
-    for i, tick in enumerate(ticks):
-        print(f"\n--- Processing tick {i+1}/{len(ticks)}: Price={tick['quote']} ---")
-        
-        # Close any expired positions
-        to_close = []
-        for entry_tick, pos in open_positions.items():
-            if i >= pos['exit_tick']:
-                # Simulate outcome at expiry
-                exit_price = tick['quote']
-                is_win = simulate_trade_outcome(pos.get('consensus_score', 0.5))
-                payout = stake * 0.82 if is_win else 0.0  # Deriv payout approximation
-                profit = payout - stake
-                
-                total_trades += 1
-                if is_win:
-                    wins += 1
-                    print(f"  ✅ CLOSED TRADE (WIN): Entry@{pos['entry_price']}, Exit@{exit_price}, Profit=${profit:.2f}")
-                else:
-                    losses += 1
-                    print(f"  ❌ CLOSED TRADE (LOSS): Entry@{pos['entry_price']}, Exit@{exit_price}, Profit=${profit:.2f}")
-                
-                net_profit += profit
-                to_close.append(entry_tick)
-        
-        for tick_idx in to_close:
-            del open_positions[tick_idx]
+    # Signal pass: strategies and consensus in Python, sides/scores into arrays
+    # Strategies read Tick attributes; build them once from the array columns
+    strategy_ticks = [
+        Tick(quote, epoch, settings.SYMBOL)
+        for quote, epoch in zip(quotes.tolist(), ticks['epoch'].tolist())
+    ]
+    for i, tick in enumerate(strategy_ticks):
+        logger.debug("--- Processing tick %d/%d: Price=%s ---", i + 1, len(ticks), tick.quote)
         
         # Get signals from each strategy
         strategy_signals = []
@@ -101,64 +203,101 @@ def test_signal_generation():
             try:
                 signal = strategy.on_tick(tick)
                 if signal:
-                    print(f"  {strategy.name}: {signal}")
+                    logger.debug("  %s: %s", strategy.name, signal)
                     strategy_signals.append(signal)
                 else:
-                    print(f"  {strategy.name}: No signal")
+                    logger.debug("  %s: No signal", strategy.name)
             except Exception as e:
                 print(f"  {strategy.name}: ERROR - {e}")
         
         # Aggregate with consensus
         if strategy_signals:
             try:
-                consensus_result = consensus.aggregate(strategy_signals, tick['quote'])
+                consensus_result = consensus.aggregate(strategy_signals, tick.quote)
                 if consensus_result:
-                    print(f"  CONSENSUS: {consensus_result}")
-                    all_signals.append({
+                    logger.debug("  CONSENSUS: %s", consensus_result)
+                    all_signals[sig_count] = {
                         'tick': i,
-                        'price': tick['quote'],
+                        'price': tick.quote,
                         'signals': strategy_signals,
                         'consensus': consensus_result
-                    })
+                    }
+                    sig_count += 1
                     
-                    # Simulate trade entry
+                    # Record the trade entry for the replay
                     side = consensus_result['side']
-                    entry_price = tick['quote']
-                    exit_tick = i + contract_duration_ticks
-                    open_positions[i] = {
-                        'side': side,
-                        'entry_price': entry_price,
-                        'exit_tick': exit_tick,
-                        'consensus_score': consensus_result['score']
-                    }
-                    print(f"  🚀 SIMULATED TRADE ENTRY: {side} @ {entry_price}, Exit in {contract_duration_ticks} ticks")
+                    sides[i] = _SIDE_CODES.get(side, SIDE_NONE)
+                    scores[i] = consensus_result['score']
+                    logger.debug("  🚀 SIMULATED TRADE ENTRY: %s @ %s, Exit in %d ticks",
+                                 side, tick.quote, contract_duration_ticks)
                 else:
-                    print("  CONSENSUS: No consensus")
+                    logger.debug("  CONSENSUS: No consensus")
             except Exception as e:
                 print(f"  CONSENSUS: ERROR - {e}")
         else:
-            print("  No signals from any strategy")
-    
-    # Close any remaining positions at end
-    for entry_tick, pos in open_positions.items():
-        exit_price = ticks[-1]['quote']  # Use last price
-        is_win = simulate_trade_outcome(pos.get('consensus_score', 0.5))
-        payout = stake * 0.82 if is_win else 0.0
-        profit = payout - stake
-        
-        total_trades += 1
-        if is_win:
-            wins += 1
-            print(f"  ✅ FINAL CLOSED TRADE (WIN): Entry@{pos['entry_price']}, Exit@{exit_price}, Profit=${profit:.2f}")
-        else:
-            losses += 1
-            print(f"  ❌ FINAL CLOSED TRADE (LOSS): Entry@{pos['entry_price']}, Exit@{exit_price}, Profit=${profit:.2f}")
-        
-        net_profit += profit
+            logger.debug("  No signals from any strategy")
+    
+    del all_signals[sig_count:]
+    
+    # Replay pass: position bookkeeping and PnL in a single compiled loop
+    # (one uniform draw per possible trade, at most one trade per tick)
+    draws = generator.random(len(ticks))
+    wins, losses, net_profit, closed, positions = _replay(
+        quotes, sides, scores, draws, contract_duration_ticks, stake
+    )
+    
+    if DEBUG:
+        logger.debug("=== SIMULATED TRADES ===")
+        for entry_tick, exit_tick, profit, won in closed:
+            logger.debug("  Tick %d: %s: Entry@%s, Exit@%s, Profit=$%.2f", exit_tick,
+                         "✅ CLOSED TRADE (WIN)" if won else "❌ CLOSED TRADE (LOSS)",
+                         quotes[int(entry_tick)], quotes[int(exit_tick)], profit)
+    
+    # Close any remaining positions at end, all outcomes in one vectorized pass
+    remaining = positions[positions[:, 0] >= 0]
+    entry_ticks = remaining[:, 1].astype(np.int64)
+    win_probs = _WIN_LUT[np.clip((remaining[:, 2] * 255).astype(np.int64), 0, 255)]
+    is_win = draws[len(closed):len(closed) + len(remaining)] < win_probs
+    profits = np.where(is_win, stake * 0.82, 0.0) - stake
+    
+    n_won = int(is_win.sum())
+    wins += n_won
+    losses += len(remaining) - n_won
+    net_profit += float(profits.sum())
+    
+    if DEBUG:
+        exit_price = quotes[-1]  # Use last price
+        for entry_tick, won, profit in zip(entry_ticks, is_win, profits):
+            logger.debug("  %s: Entry@%s, Exit@%s, Profit=$%.2f",
+                         "✅ FINAL CLOSED TRADE (WIN)" if won else "❌ FINAL CLOSED TRADE (LOSS)",
+                         quotes[entry_tick], exit_price, profit)
+    
+    return {
+        'config': cfg,
+        'ticks': len(ticks),
+        'signals': all_signals,
+        'total_trades': wins + losses,
+        'wins': wins,
+        'losses': losses,
+        'net_profit': net_profit,
+    }
+
+def test_signal_generation(warmed_strategies):
+    """Test signal generation from all strategies with trade simulation"""
+    print("=== SIGNAL GENERATION & TRADE SIMULATION TEST ===")
+    
+    # Reuse the shared instances (run_once resets them)
+    strategies, consensus = warmed_strategies
+    print(f"Generating {DEFAULT_CONFIG['num_ticks']} fake ticks")
+    result = run_once(DEFAULT_CONFIG, strategies, consensus)
+    all_signals = result['signals']
+    wins, losses = result['wins'], result['losses']
+    total_trades = result['total_trades']
+    net_profit = result['net_profit']
     
     # Summary
     print("\n=== TEST SUMMARY ===")
-    print(f"Total ticks processed: {len(ticks)}")
+    print(f"Total ticks processed: {result['ticks']}")
     print(f"Total consensus signals: {len(all_signals)}")
     print(f"Total simulated trades: {total_trades}")
     print(f"Wins: {wins}, Losses: {losses}")
@@ -181,5 +320,39 @@ def test_signal_generation():
         except Exception as e:
             print(f"{strategy.name}: ERROR getting metrics - {e}")
 
+def _sweep_configs() -> List[Dict]:
+    """Parameter grid for --sweep, one seed per config"""
+    configs = []
+    for num_ticks in (100, 500, 2000):
+        for duration in (3, 5, 10):
+            configs.append({
+                'num_ticks': num_ticks,
+                'contract_duration_ticks': duration,
+                'seed': len(configs),
+            })
+    return configs
+
+def run_sweep(configs: List[Dict]) -> List[Dict]:
+    """Run configs across worker processes and print one line per config"""
+    # spawn, not fork: workers start clean and load the njit cache from disk
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool() as pool:
+        results = pool.map(run_once, configs)
+    
+    print("=== PARAMETER SWEEP ===")
+    for result in results:
+        cfg = result['config']
+        total_trades = result['total_trades']
+        win_rate = (result['wins'] / total_trades * 100) if total_trades > 0 else 0
+        print(f"ticks={cfg['num_ticks']:>5} duration={cfg['contract_duration_ticks']:>2}: "
+              f"signals={len(result['signals'])}, trades={total_trades}, "
+              f"win_rate={win_rate:.1f}%, net=${result['net_profit']:.2f}")
+    return results
+
 if __name__ == "__main__":
-    test_signal_generation()
\ No newline at end of file
+    logger.setLevel(TEST_LOG_LEVEL)
+    _warm_up_kernels()
+    if "--sweep" in sys.argv[1:]:
+        run_sweep(_sweep_configs())
+    else:
+        test_signal_generation(_get_strategies())
\ No newline at end of file
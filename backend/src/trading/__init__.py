@@ -1,7 +1,41 @@
 # backend/src/trading/__init__.py
-from .position_manager import position_manager
-from .order_executor import order_executor
-from .bot import trading_bot
-from .performance import performance
+import importlib
+import sys
+import types
 
-__all__ = ["position_manager", "order_executor", "trading_bot", "performance"]
\ No newline at end of file
+__all__ = ["position_manager", "order_executor", "trading_bot", "performance"]
+
+# Singletons are imported on first access (PEP 562) so that importing one
+# of them does not pull in the others - bot.py in particular is heavy
+_LAZY = {
+    "position_manager": "position_manager",
+    "order_executor": "order_executor",
+    "trading_bot": "bot",
+    "performance": "performance",
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module(f".{_LAZY[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value  # cache so later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+class _TradingPackage(types.ModuleType):
+    """Package module that keeps the singleton names free of submodules.
+
+    Importing e.g. src.trading.performance binds the submodule on the package
+    under the same name as the singleton; skip that binding so the name still
+    resolves to the singleton through __getattr__.
+    """
+
+    def __setattr__(self, name, value):
+        if name in _LAZY and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+sys.modules[__name__].__class__ = _TradingPackage
\ No newline at end of file
@@ -1,8 +1,10 @@
 # backend/src/trading/bot.py
 import asyncio
 import time
-from typing import Dict
-from datetime import datetime
+from collections import Counter, deque
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 import uuid  # Add this import at the top
 
 from src.core.deriv_api import deriv
@@ -17,6 +19,8 @@ from src.strategies.breakout import BreakoutStrategy
 from src.core.market_analyzer import market_analyzer
 from src.core.signal_consensus import SignalConsensus
 from src.core.risk_manager import risk_manager
+from src.core.tick import Tick
+from src.indicators.kernels import warm_up as warm_up_kernels
 
 # Executors + managers
 from src.trading.order_executor import order_executor
@@ -24,20 +28,36 @@ from src.trading.position_manager import position_manager
 from src.trading.performance import performance
 from src.config.settings import settings
 
+# Persistence
+from src.db.session import SessionLocal
+from src.db.models.trade import Trade
+from src.db.repositories.trade_history_repo import TradeHistoryRepo
+
 # WebSocket broadcasting
 from src.api.websocket import (
     broadcast_balance_update,
     broadcast_performance_update,
     broadcast_trade_update,
-    broadcast_signal
+    broadcast_signals,
+    ws_manager
 )
 
-import numpy as np
 from src.config.settings import settings
 
 # Add import for the new helper (for consistency, though not directly used here)
 from src.utils.helpers import Helpers
 
+# Consensus requirements per market regime: (min score, min agreeing sources).
+# Ranging markets need one strong signal, trending markets two weaker ones.
+REGIME_THRESHOLDS = {
+    "RANGING": (0.70, 1),
+    "TRENDING": (0.60, 2),
+}
+DEFAULT_REGIME_THRESHOLD = (0.65, 2)
+
+# Legacy CALL/PUT sides mapped onto RISE/FALL
+_SIDE_ALIASES = {"CALL": "RISE", "PUT": "FALL"}
+
 class TradingBot:
     def __init__(self):
         """Initialize strategies, ML consensus, risk model, performance tracker"""
@@ -64,11 +84,15 @@ class TradingBot:
         self.risk = risk_manager
         self.performance = performance
 
+        # Traded symbol - fixed for the process, bound once for the tick path
+        self.symbol = settings.SYMBOL
+
         self.running = False
         self._bot_task = None  # Add this to track the bot task
-        self._last_tick_time = 0
+        # Throttle timestamps are time.monotonic() readings - immune to wall-clock steps
+        self._last_tick_time = float("-inf")
         self.min_tick_interval = 0.05
-        self.last_trade_time = 0
+        self.last_trade_time = float("-inf")
         self.min_trade_interval = 15
         self.latest_price = None
 
@@ -78,9 +102,56 @@ class TradingBot:
             for strat in self.strategies
         }
 
-        self.signal_history = []
+        # Bounded - the deque evicts the oldest signal in O(1)
+        self.signal_history = deque(maxlen=1000)
         self.signal_counter = 0
         self.session_open = None
+        # Strong refs to fire-and-forget tasks so they aren't garbage collected mid-flight
+        self._background_tasks = set()
+
+    def _spawn(self, coro):
+        """Run a coroutine in the background without awaiting it"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    # ===============================================================  
+    # 📈 STRATEGY EVALUATION (SYNCHRONOUS HOT PATH)
+    # ===============================================================  
+    def _collect_signals(self, tick: Tick) -> List[Dict]:
+        """Run every strategy on the tick and return their signals normalized for consensus
+
+        Pure computation - no I/O or awaits - so the per-tick numeric work
+        stays separate from the async handler around it.
+        """
+        signals = []
+        for strat in self.strategies:
+            try:
+                sig = strat.on_tick(tick)
+                if sig:
+                    # CHANGED: Convert CALL/PUT to RISE/FALL
+                    side = sig.get("side", "").upper()
+                    signals.append({
+                        "side": _SIDE_ALIASES.get(side, side),  # USING RISE/FALL
+                        "score": float(sig.get("score", 0)),
+                        "meta": sig.get("meta", {}),
+                        "strategy": strat.name
+                    })
+            except Exception as e:
+                logger.debug("[%s] Signal error: %s", strat.name, e)
+        return signals
+
+    @staticmethod
+    def _parse_tick_generic(msg) -> Tuple[Dict, Optional[str], Any]:
+        """Extract (tick, symbol, raw price) from any tick-like message shape"""
+        tick = msg.get("tick") if isinstance(msg, dict) and "tick" in msg else msg
+        if not isinstance(tick, dict):
+            return tick, None, None
+
+        for k in ("quote", "price", "ask", "bid"):
+            if tick.get(k) is not None:
+                return tick, tick.get("symbol"), tick[k]
+        return tick, tick.get("symbol"), None
 
     # ===============================================================  
     # 📡 TICK HANDLER WITH WEBSOCKET BROADCASTING
@@ -93,20 +164,22 @@ class TradingBot:
                 return
             
             # ======== TICK THROTTLE ========
-            current_time = time.time()
+            # Clock read once per tick and reused below
+            current_time = time.monotonic()
             if current_time - self._last_tick_time < self.min_tick_interval:
                 return
             self._last_tick_time = current_time
             # ================================
             
-            tick = msg.get("tick") if isinstance(msg, dict) and "tick" in msg else msg
-            
-            symbol = tick.get("symbol") if isinstance(tick, dict) else None
-            price_raw = None
-            for k in ("quote", "price", "ask", "bid"):
-                if isinstance(tick, dict) and tick.get(k) is not None:
-                    price_raw = tick.get(k)
-                    break
+            # Fast path for the Deriv tick schema: {"tick": {"quote", "symbol", "epoch"}}
+            try:
+                tick = msg["tick"]
+                price_raw = tick["quote"]
+                symbol = tick.get("symbol")
+            except (KeyError, TypeError, AttributeError):
+                price_raw = None
+            if price_raw is None:
+                tick, symbol, price_raw = self._parse_tick_generic(msg)
 
             try:
                 price = float(price_raw)
@@ -114,102 +187,86 @@ class TradingBot:
                 price = 0.0
                 
             if price <= 0:
-                logger.debug(f"Skipping tick with non-positive price: {price_raw}")
+                logger.debug("Skipping tick with non-positive price: %s", price_raw)
                 return
 
             self.latest_price = price
 
             if self.session_open is None:
                 self.session_open = price
-                logger.info(f"Session open set to: {self.session_open}")
+                logger.info("Session open set to: %s", self.session_open)
+
+            # ======== TRADE COOLDOWN ========
+            # Nothing can trade until the interval has passed, so skip the
+            # analysis and strategy pipeline; the analyzer still records the
+            # price so its history has no gaps when the cooldown ends
+            if current_time - self.last_trade_time < self.min_trade_interval:
+                self.market_analyzer.record_price(price)
+                return
+            # ================================
 
             # 1. MARKET ANALYZER
             market_status = self.market_analyzer.analyze_market(price)
-            logger.debug(f"📊 Market Analysis: tradable={market_status['tradable']}, regime={market_status.get('regime')}, volatility={market_status.get('volatility', 0):.6f}, trend_strength={market_status.get('trend_strength', 0):.6f}")
+            logger.debug(
+                "📊 Market Analysis: tradable=%s, regime=%s, volatility=%.6f, trend_strength=%.6f",
+                market_status['tradable'], market_status.get('regime'),
+                market_status.get('volatility', 0), market_status.get('trend_strength', 0)
+            )
             
             if not market_status["tradable"]:
-                logger.info(f"⛔ Market not tradable → {market_status['reason']} | Regime: {market_status.get('regime', 'UNKNOWN')}")
+                logger.info("⛔ Market not tradable → %s | Regime: %s", market_status['reason'], market_status.get('regime', 'UNKNOWN'))
                 return
 
-            # 2. TIME FILTER
-            if time.time() - self.last_trade_time < self.min_trade_interval:
-                return
+            # 2. STRATEGY SIGNAL EXTRACTION - CONVERTING TO RISE/FALL
+            # Wall-clock fallback only for ticks that arrive without an epoch
+            epoch = tick.get("epoch") or int(time.time())
+            signals = self._collect_signals(Tick(price, int(epoch), self.symbol))
 
-            # 3. STRATEGY SIGNAL EXTRACTION - CONVERTING TO RISE/FALL
-            signals = []
-            for strat in self.strategies:
-                try:
-                    sig = strat.on_tick({"quote": price, "symbol": settings.SYMBOL, "epoch": tick.get("epoch", int(time.time()))})
-                    if sig:
-                        # CHANGED: Convert CALL/PUT to RISE/FALL
-                        original_side = sig.get("side", "").upper()
-                        if original_side == "CALL":
-                            converted_side = "RISE"
-                        elif original_side == "PUT":
-                            converted_side = "FALL"
-                        else:
-                            converted_side = original_side
-                        
-                        # Normalize signal format for consensus
-                        normalized_signal = {
-                            "side": converted_side,  # USING RISE/FALL
-                            "score": float(sig.get("score", 0)),
-                            "meta": sig.get("meta", {}),
-                            "strategy": strat.name
-                        }
-                        signals.append(normalized_signal)
-                except Exception as e:
-                    logger.debug(f"[{strat.name}] Signal error: {e}")
-        
             if signals:
-                if len(self.signal_history) > 1000:
-                    self.signal_history = self.signal_history[-1000:]
+                logger.info("📊 Got %d signals from strategies", len(signals))
 
-                logger.info(f"📊 Got {len(signals)} signals from strategies")
-
-                # STORE AND BROADCAST SIGNALS - USING RISE/FALL
-                for sig in signals:
-                    signal_data = {
+                # STORE SIGNALS - USING RISE/FALL
+                records = [
+                    {
                         "id": str(uuid.uuid4()),  # Use UUID for guaranteed uniqueness instead of counter + timestamp
-                        "direction": sig.get("side") or "UNKNOWN",  # RISE/FALL
-                        "confidence": float(sig.get("score", 0)),
+                        "direction": sig["side"] or "UNKNOWN",  # RISE/FALL
+                        "confidence": sig["score"],
                         "price": price,
                         "symbol": symbol,
-                        "timestamp": tick.get("epoch", int(time.time())),
-                        "strategy": sig.get("strategy", "unknown"),
-                        "message": f"{sig.get('side', 'UNKNOWN')} signal from {sig.get('strategy', 'unknown')}",
-                        "score": sig.get("score", 0)
+                        "timestamp": epoch,
+                        "strategy": sig["strategy"],
+                        "message": f"{sig['side']} signal from {sig['strategy']}",
+                        "score": sig["score"]
                     }
+                    for sig in signals
+                ]
+                self.signal_history.extend(records)
+                self.signal_counter += len(records)
 
-                    try:
-                        self.signal_history.append(signal_data)
-                        self.signal_counter += 1
-                        
-                        # Track strategy performance
-                        strat_name = sig.get("strategy")
-                        if strat_name in self.strategy_performance:
-                            if sig["side"] == "RISE":
-                                self.strategy_performance[strat_name]["rise"] += 1
-                            elif sig["side"] == "FALL":
-                                self.strategy_performance[strat_name]["fall"] += 1
-                                
-
-                        # BROADCAST SIGNAL VIA WEBSOCKET
-                        await broadcast_signal(signal_data)
-                        logger.debug(f"📡 Signal broadcasted: {signal_data['direction']} from {strat_name}")
-                                
-
-                    except Exception as e:
-                        logger.warning(f"Failed to process signal: {e}")
+                # Track strategy performance
+                for sig in signals:
+                    counts = self.strategy_performance.get(sig["strategy"])
+                    if counts is not None:
+                        if sig["side"] == "RISE":
+                            counts["rise"] += 1
+                        elif sig["side"] == "FALL":
+                            counts["fall"] += 1
+
+                # BROADCAST SIGNALS VIA WEBSOCKET - in the background so sends never delay
+                # the trade decision (skipped outright when no UI is connected)
+                if ws_manager.has_clients():
+                    self._spawn(broadcast_signals(records))
 
             else:
+                # Nothing for consensus to aggregate - stop here
                 logger.info("📡 No signals from strategies")
+                return
 
-            # 4. CONSENSUS (USING SINGLE CONSENSUS INSTANCE) - NOW USING RISE/FALL
+            # 3. CONSENSUS (USING SINGLE CONSENSUS INSTANCE) - NOW USING RISE/FALL
             consensus = self.consensus.aggregate(signals, price, self.session_open)
 
-            logger.debug(f"Signals count: {len(signals)}")
-            logger.debug(f"Consensus score: {consensus.get('score', 0) if consensus else 'No consensus'}")
+            logger.debug("Signals count: %d", len(signals))
+            logger.debug("Consensus score: %s", consensus.get('score', 0) if consensus else 'No consensus')
 
             if consensus:
                 # CHANGED: Convert consensus side from CALL/PUT to RISE/FALL
@@ -219,9 +276,9 @@ class TradingBot:
                 elif consensus_side == "PUT":
                     consensus["side"] = "FALL"
                     
-                logger.info(f"✅ CONSENSUS PASSED → {consensus['side']}")
+                logger.info("✅ CONSENSUS PASSED → %s", consensus['side'])
             else:
-                logger.info(f"❌ CONSENSUS FAILED - No consensus from {len(signals)} signals")
+                logger.info("❌ CONSENSUS FAILED - No consensus from %d signals", len(signals))
                 return
 
             if consensus.get("sources", 0) < 1:
@@ -233,35 +290,23 @@ class TradingBot:
             # Check if this is a single trusted signal (already validated by consensus)
             if consensus.get("method") == "single_trusted_signal":
                 # Single trusted signal is always acceptable regardless of regime
-                logger.info(f"✅ Accepting single trusted signal from {consensus.get('strategies', ['unknown'])[0]}")
+                logger.info("✅ Accepting single trusted signal from %s", consensus.get('strategies', ['unknown'])[0])
                 min_consensus_score = consensus.get("score", 0)  # Use the signal's own score
-            elif market_regime == "RANGING":
-                # In ranging markets, require at least 1 strong signal
-                min_consensus_score = 0.70
-                if consensus.get("sources", 0) < 1:
-                    logger.info(f"❌ Need at least 1 strong signal in RANGING market, got {consensus.get('sources', 0)}")
-                    return
-            elif market_regime == "TRENDING":
-                # In trending markets, require 2+ signals
-                min_consensus_score = 0.60
-                if consensus.get("sources", 0) < 2:
-                    logger.info(f"❌ Need at least 2 signals in TRENDING market, got {consensus.get('sources', 0)}")
-                    return
             else:
-                # Default: require 2+ signals
-                min_consensus_score = 0.65
-                if consensus.get("sources", 0) < 2:
-                    logger.info(f"❌ Need at least 2 signals, got {consensus.get('sources', 0)}")
+                min_consensus_score, min_sources = REGIME_THRESHOLDS.get(market_regime, DEFAULT_REGIME_THRESHOLD)
+                sources = consensus.get("sources", 0)
+                if sources < min_sources:
+                    logger.info("❌ Need at least %d signals in %s market, got %s", min_sources, market_regime, sources)
                     return
             # ===========================================================
             
             if consensus["score"] < min_consensus_score:
-                logger.info(f"❌ Consensus score too low for regime {market_regime}: {consensus['score']} < {min_consensus_score}")
+                logger.info("❌ Consensus score too low for regime %s: %s < %s", market_regime, consensus['score'], min_consensus_score)
                 return
 
-            logger.info(f"✅ CONSENSUS OK → {consensus['side']} | Market Regime: {market_regime}, Score: {consensus['score']:.2f}")
+            logger.info("✅ CONSENSUS OK → %s | Market Regime: %s, Score: %.2f", consensus['side'], market_regime, consensus['score'])
 
-            # 5. RISK MANAGER CHECKS
+            # 4. RISK MANAGER CHECKS
             try:
                 balance = await deriv.get_balance()
                 # BROADCAST BALANCE UPDATE
@@ -278,28 +323,30 @@ class TradingBot:
             recovery_metrics = self.risk.get_recovery_metrics()
             
             if settings.RECOVERY_ENABLED and recovery_metrics["recovery_streak"] > 0:
-                logger.info(f"🟡 Recovery active: using recovery amount ${trade_amount:.2f}")
+                logger.info("🟡 Recovery active: using recovery amount $%.2f", trade_amount)
             else:
-                logger.info(f"🟢 Normal mode: using base trade amount ${trade_amount:.2f}")
+                logger.info("🟢 Normal mode: using base trade amount $%.2f", trade_amount)
 
             if not self.risk.allow_trade(position_manager.get_open_count(), balance):
                 logger.info("⛔ RiskManager blocked trade")
                 return
 
-            # 6. PRICE STABILITY CHECK
+            # 5. PRICE STABILITY CHECK
+            # No blind wait here: Deriv listeners are dispatched one message at
+            # a time, so no newer tick can land while this handler is running.
+            # The check still guards against a price updated concurrently
             signal_generated_price = price
-            await asyncio.sleep(0.1)
 
             if self.latest_price and abs(self.latest_price - signal_generated_price) / signal_generated_price > 0.001:
                 price_move_pct = ((self.latest_price - signal_generated_price) / signal_generated_price * 100)
-                logger.info(f"⚠️ Price moved {price_move_pct:.2f}%, skipping trade")
+                logger.info("⚠️ Price moved %.2f%%, skipping trade", price_move_pct)
                 return
 
-            # 7. EXECUTE TRADE - USING RISE/FALL
+            # 6. EXECUTE TRADE - USING RISE/FALL
             side = consensus["side"]  # RISE or FALL
             logger.info(
-                f"🚀 EXECUTING TRADE: side={side}, amount={trade_amount}, "
-                f"method={consensus.get('method')}, regime={market_regime}"
+                "🚀 EXECUTING TRADE: side=%s, amount=%s, method=%s, regime=%s",
+                side, trade_amount, consensus.get('method'), market_regime
             )
 
             try:
@@ -310,16 +357,20 @@ class TradingBot:
                 trade_id = await order_executor.place_trade(
                     side=order_side,  # Using CALL/PUT for API
                     amount=trade_amount,  # This is the stake amount
-                    symbol=settings.SYMBOL
+                    symbol=self.symbol
                 )
 
+                # Signals per strategy, counted in one pass (zero for silent strategies)
+                signal_counts = Counter(sig.get("strategy") for sig in signals)
+                strategy_breakdown = {s.name: signal_counts[s.name] for s in self.strategies}
+
                 # Store consensus data for ML training
                 order_executor.trades[trade_id]["consensus_data"] = {
                     "method": consensus.get("method"),
                     "signals_count": len(signals),
                     "traditional_score": consensus.get("traditional_score", 0),
                     "ml_score": consensus.get("ml_score", 0),
-                    "strategy_breakdown": {s.name: 0 for s in self.strategies},
+                    "strategy_breakdown": strategy_breakdown,
                     "signals": signals,  # Store normalized signals for ML
                     "market_regime": market_regime,
                     "volatility": market_status.get("volatility"),
@@ -333,32 +384,27 @@ class TradingBot:
                     "min_required_score": min_consensus_score
                 }
 
-                for sig in signals:
-                    strat_name = sig.get("strategy")
-                    if strat_name in order_executor.trades[trade_id]["consensus_data"]["strategy_breakdown"]:
-                        order_executor.trades[trade_id]["consensus_data"]["strategy_breakdown"][strat_name] += 1
-
-                self.last_trade_time = time.time()
-                logger.info(f"✅ Trade placed: {trade_id}")
+                self.last_trade_time = time.monotonic()
+                logger.info("✅ Trade placed: %s", trade_id)
                 
                 # BROADCAST TRADE UPDATE
                 trade_data = {
                     "trade_id": trade_id,
                     "side": side,
                     "amount": trade_amount,
-                    "symbol": settings.SYMBOL,
+                    "symbol": self.symbol,
                     "status": "PENDING",
                     "timestamp": time.time(),
                     "consensus_score": consensus["score"]
                 }
                 await broadcast_trade_update(trade_data)
-                logger.debug(f"📤 Trade broadcasted: {trade_id}")
+                logger.debug("📤 Trade broadcasted: %s", trade_id)
 
             except Exception as e:
-                logger.exception(f"❌ Trade execution failed: {e}")
+                logger.exception("❌ Trade execution failed: %s", e)
         
         except Exception as e:
-            logger.error(f"Error in _tick_handler: {e}")
+            logger.error("Error in _tick_handler: %s", e)
 
     # ===============================================================  
     # MAIN BOT LOOP
@@ -436,6 +482,12 @@ class TradingBot:
         except Exception as e:
             logger.error(f"Failed to start risk session: {e}")
 
+        # Compile the strategy kernels before ticks arrive (off the event loop)
+        try:
+            await asyncio.to_thread(warm_up_kernels)
+        except Exception:
+            logger.exception("Failed to warm up strategy kernels")
+
         # Remove any existing tick handler first to prevent duplicates
         try:
             await deriv.remove_listener(self._tick_handler)
@@ -447,30 +499,20 @@ class TradingBot:
         await deriv.subscribe_ticks(settings.SYMBOL)
         logger.info(f"📡 Subscribed to ticks: {settings.SYMBOL}")
 
-        monitor_interval = 300
-        last_monitor_time = 0
-        cleanup_interval = 60
-        last_cleanup = 0
-        last_performance_broadcast = 0
-
-        while self.running:
-            now = asyncio.get_event_loop().time()
-
-            if now - last_monitor_time > monitor_interval:
-                await self._report_performance()
-                last_monitor_time = now
-
-            # Broadcast performance every 30 seconds
-            if now - last_performance_broadcast > 30:
-                await self._broadcast_performance_metrics()
-                last_performance_broadcast = now
+        # Periodic jobs run as their own tasks; this coroutine only wakes
+        # when the Deriv session drops and needs re-establishing
+        jobs = [
+            asyncio.create_task(self._every(300, self._report_performance)),
+            asyncio.create_task(self._every(30, self._broadcast_performance_metrics)),
+            asyncio.create_task(self._every(60, self._cleanup_expired_trades)),
+        ]
+        self._bot_task = asyncio.current_task()
 
-            if now - last_cleanup > cleanup_interval:
-                await self._cleanup_expired_trades()
-                last_cleanup = now
+        try:
+            while self.running:
+                await deriv.disconnected.wait()
 
-            # Health check: verify connection is still active
-            if not deriv.authorized:
+                # Reconnect: a successful authorize clears the event again
                 logger.warning("⚠️ Connection lost, attempting to reconnect...")
                 try:
                     await deriv.connect()
@@ -481,13 +523,22 @@ class TradingBot:
                     else:
                         logger.error("❌ Reauthorization failed")
                         await asyncio.sleep(5)
-                        continue
                 except Exception as e:
                     logger.error(f"Reconnection failed: {e}")
                     await asyncio.sleep(5)
-                    continue
+        finally:
+            for job in jobs:
+                job.cancel()
+            self._bot_task = None
 
-            await asyncio.sleep(1)
+    async def _every(self, interval: float, job):
+        """Run `job` now and then every `interval` seconds while the bot is running"""
+        while self.running:
+            try:
+                await job()
+            except Exception:
+                logger.exception(f"Periodic job {job.__name__} failed")
+            await asyncio.sleep(interval)
 
     async def stop(self):
         """Properly stop the bot"""
@@ -516,24 +567,32 @@ class TradingBot:
     
         logger.info("✅ Trading Bot stopped")
 
-    async def _cleanup_expired_trades(self):
-        """Clean up trades that should have expired"""
-        try:
-            from src.db.session import SessionLocal
-            from src.db.models.trade import Trade
-            from datetime import datetime, timedelta
-
-            db = SessionLocal()
-            cutoff = datetime.utcnow() - timedelta(minutes=3)
-
-            expired = db.query(Trade).filter(
+    def _cleanup_expired_trades_sync(self):
+        """Mark trades ACTIVE for over 3 minutes as LOST; returns the (id, amount, created_at) rows"""
+        cutoff = datetime.utcnow() - timedelta(minutes=3)
+        # The context manager closes the session even if the query raises
+        with SessionLocal() as db:
+            expired = db.query(Trade.id, Trade.stake_amount.label("amount"), Trade.created_at).filter(
                 Trade.status == "ACTIVE",
                 Trade.created_at < cutoff
             ).all()
 
+            if expired:
+                # One bulk UPDATE instead of a per-row flush
+                db.query(Trade).filter(Trade.id.in_([trade.id for trade in expired])).update(
+                    {Trade.status: "LOST"}, synchronize_session=False
+                )
+                db.commit()
+            return expired
+
+    async def _cleanup_expired_trades(self):
+        """Clean up trades that should have expired"""
+        try:
+            # Blocking DB round-trips run in a worker thread, off the event loop
+            expired = await asyncio.to_thread(self._cleanup_expired_trades_sync)
+
             for trade in expired:
                 logger.warning(f"Trade {trade.id} expired (created at {trade.created_at}) - marking as LOST")
-                trade.status = "LOST"
                 self.risk.update_trade_outcome("LOST", trade.amount)
                 
                 # BROADCAST TRADE CLOSURE
@@ -545,9 +604,6 @@ class TradingBot:
                 }
                 await broadcast_trade_update(trade_data)
 
-            db.commit()
-            db.close()
-
             if expired:
                 logger.info(f"Cleaned up {len(expired)} expired trades")
                 # BROADCAST PERFORMANCE UPDATE AFTER CLEANUP
@@ -624,9 +680,8 @@ class TradingBot:
             logger.info(f"Consec. Rejects  : {market_metrics['consecutive_rejects']}")
             
             if settings.RECOVERY_ENABLED and recovery_metrics.get('recovery_history_count', 0) > 0:
-                successful_recoveries = sum(1 for h in self.risk.recovery_history if h.get('recovered', False))
-                recovery_rate = (successful_recoveries / recovery_metrics['recovery_history_count']) * 100 if recovery_metrics['recovery_history_count'] > 0 else 0
-                logger.info(f"Recovery Success : {recovery_rate:.1f}% ({successful_recoveries}/{recovery_metrics['recovery_history_count']})")
+                recovery_stats = self.risk.get_recovery_stats()
+                logger.info(f"Recovery Success : {recovery_stats['recovery_rate']:.1f}% ({recovery_stats['successful_recoveries']}/{recovery_stats['total_attempts']})")
             
             lock_status = "UNLOCKED"
             if risk.get('state') == 'locked':
@@ -662,11 +717,12 @@ class TradingBot:
             logger.exception("Performance reporting error")
 
     def get_bot_metrics(self) -> Dict:
-        """Get current bot performance metrics - SINGLE METHOD"""
+        """Get current bot performance metrics - SINGLE METHOD
+
+        Values may include numpy scalars; serialize with orjson
+        (OPT_SERIALIZE_NUMPY) at the API boundary.
+        """
         try:
-            from src.db.repositories.trade_history_repo import TradeHistoryRepo
-            from src.trading.performance import performance
-            
             stats = TradeHistoryRepo.get_trading_stats()
             perf_data = performance.get_performance_summary()
             
@@ -712,30 +768,10 @@ class TradingBot:
             if settings.RECOVERY_ENABLED:
                 base_metrics["recovery_metrics"] = self.risk.get_recovery_metrics()
                 
-                recovery_history = self.risk.recovery_history
-                if recovery_history:
-                    successful_recoveries = sum(1 for h in recovery_history if h.get('recovered', False))
-                    base_metrics["recovery_stats"] = {
-                        "total_attempts": len(recovery_history),
-                        "successful_recoveries": successful_recoveries,
-                        "recovery_rate": round((successful_recoveries / len(recovery_history)) * 100, 1) if len(recovery_history) > 0 else 0,
-                        "avg_streak_length": round(sum(h.get('streak', 0) for h in recovery_history) / len(recovery_history), 1) if len(recovery_history) > 0 else 0
-                    }
-            
-            # Convert numpy types to Python native types for JSON serialization
-            def convert_to_serializable(obj):
-                if isinstance(obj, dict):
-                    return {key: convert_to_serializable(value) for key, value in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_to_serializable(item) for item in obj]
-                elif hasattr(obj, 'item'):
-                    return obj.item()
-                elif isinstance(obj, (np.float32, np.float64, np.int32, np.int64)):
-                    return float(obj) if isinstance(obj, (np.float32, np.float64)) else int(obj)
-                else:
-                    return obj
+                if self.risk.recovery_history:
+                    base_metrics["recovery_stats"] = self.risk.get_recovery_stats()
             
-            return convert_to_serializable(base_metrics)
+            return base_metrics
             
         except Exception as e:
             logger.error(f"Error getting bot metrics: {e}")
@@ -802,7 +838,10 @@ class TradingBot:
 
     def get_recent_signals(self, limit: int = 10):
         """Return the most recent signals from history"""
-        return self.signal_history[-limit:] if self.signal_history else []
+        # Walk back from the newest end so the cost is O(limit), not O(len(history))
+        recent = list(islice(reversed(self.signal_history), max(0, limit)))
+        recent.reverse()
+        return recent
     
     # ===============================================================  
     # NEW: UPDATE STRATEGY PERFORMANCE
@@ -0,0 +1,62 @@
+# backend/src/utils/contract_log.py
+import struct
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator
+
+# One fixed-width little-endian record per contract snapshot:
+# timestamp, contract_id, is_sold, is_expired, status code,
+# payout, sell_price, profit, entry_tick, exit_tick, message type code
+RECORD = struct.Struct("<d32s??BdddddB")
+
+STATUS_CODES = ("unknown", "open", "opened", "sold", "won", "lost", "cancelled")
+MESSAGE_TYPE_CODES = ("", "contract_update", "sell", "buy")
+
+_STATUS_INDEX = {s: i for i, s in enumerate(STATUS_CODES)}
+_MESSAGE_TYPE_INDEX = {s: i for i, s in enumerate(MESSAGE_TYPE_CODES)}
+
+
+def pack_snapshot(snapshot) -> bytes:
+    """Encode a ContractSnapshot as a single binary record"""
+    try:
+        ts = datetime.fromisoformat(snapshot.timestamp).timestamp()
+    except (TypeError, ValueError):
+        ts = 0.0
+
+    return RECORD.pack(
+        ts,
+        snapshot.contract_id.encode()[:32],
+        snapshot.is_sold,
+        snapshot.is_expired,
+        _STATUS_INDEX.get(snapshot.status, 0),
+        snapshot.payout,
+        snapshot.sell_price,
+        snapshot.profit,
+        snapshot.entry_tick,
+        snapshot.exit_tick,
+        _MESSAGE_TYPE_INDEX.get(snapshot.message_type, 0),
+    )
+
+
+def iter_records(fh: BinaryIO) -> Iterator[Dict]:
+    """Yield decoded records from an open binary contract log"""
+    while True:
+        chunk = fh.read(RECORD.size)
+        if len(chunk) < RECORD.size:
+            return
+
+        (ts, contract_id, is_sold, is_expired, status, payout,
+         sell_price, profit, entry_tick, exit_tick, message_type) = RECORD.unpack(chunk)
+
+        yield {
+            "timestamp": datetime.fromtimestamp(ts).isoformat() if ts else "",
+            "contract_id": contract_id.rstrip(b"\0").decode(),
+            "is_sold": is_sold,
+            "is_expired": is_expired,
+            "status": STATUS_CODES[status] if status < len(STATUS_CODES) else "unknown",
+            "payout": payout,
+            "sell_price": sell_price,
+            "profit": profit,
+            "entry_tick": entry_tick,
+            "exit_tick": exit_tick,
+            "message_type": MESSAGE_TYPE_CODES[message_type] if message_type < len(MESSAGE_TYPE_CODES) else "",
+        }
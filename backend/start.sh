@@ -33,6 +33,7 @@ check_package "PostgreSQL" "psycopg2" "print(psycopg2.__version__)"
 check_package "SQLAlchemy" "sqlalchemy" "print(sqlalchemy.__version__)"
 check_package "scikit-learn" "sklearn" "print(sklearn.__version__)"
 check_package "FastAPI" "fastapi" "print(fastapi.__version__)"
+check_package "uvloop" "uvloop" "print(uvloop.__version__)"
 check_package "NumPy" "numpy" "print(numpy.__version__)"
 check_package "Pandas" "pandas" "print(pandas.__version__)"
 
@@ -134,4 +135,4 @@ echo "🌐 Starting FastAPI server on port ${PORT}"
 echo "⏱️ Server start time: $(date)"
 echo "===================================================================="
 
-exec uvicorn src.main:app --host 0.0.0.0 --port "${PORT}" --log-level info
+exec uvicorn src.main:app --host 0.0.0.0 --port "${PORT}" --loop uvloop --log-level info